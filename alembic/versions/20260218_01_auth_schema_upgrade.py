@@ -17,17 +17,40 @@ branch_labels: Union[str, Sequence[str], None] = None
 depends_on: Union[str, Sequence[str], None] = None
 
 
-def _table_exists(inspector: sa.Inspector, table_name: str) -> bool:
-    return table_name in inspector.get_table_names()
+SchemaSnapshot = dict[str, set[str]]
 
 
-def _column_exists(inspector: sa.Inspector, table_name: str, column_name: str) -> bool:
-    return any(column["name"] == column_name for column in inspector.get_columns(table_name))
+def _reflect_schema(bind: sa.engine.Connection) -> SchemaSnapshot:
+    """Reflect table and column names once; callers keep the snapshot in sync after DDL."""
+    # get_multi_columns reflects every table in one round trip on dialects that support it.
+    return {
+        table_name: {column["name"] for column in columns}
+        for (_, table_name), columns in sa.inspect(bind).get_multi_columns().items()
+    }
 
 
-def _ensure_user_columns(inspector: sa.Inspector) -> None:
-    if not _table_exists(inspector, "users"):
-        op.create_table(
+def _table_exists(schema: SchemaSnapshot, table_name: str) -> bool:
+    return table_name in schema
+
+
+def _column_exists(schema: SchemaSnapshot, table_name: str, column_name: str) -> bool:
+    return column_name in schema.get(table_name, ())
+
+
+def _create_table(schema: SchemaSnapshot, table_name: str, *columns: sa.Column) -> None:
+    op.create_table(table_name, *columns)
+    schema[table_name] = {column.name for column in columns}
+
+
+def _add_column(schema: SchemaSnapshot, table_name: str, column: sa.Column) -> None:
+    op.add_column(table_name, column)
+    schema[table_name].add(column.name)
+
+
+def _ensure_user_columns(schema: SchemaSnapshot) -> None:
+    if not _table_exists(schema, "users"):
+        _create_table(
+            schema,
             "users",
             sa.Column("id", sa.Integer(), primary_key=True, nullable=False),
             sa.Column("email", sa.String(length=255), nullable=False),
@@ -43,30 +66,33 @@ def _ensure_user_columns(inspector: sa.Inspector) -> None:
         op.create_index("ix_users_email", "users", ["email"], unique=True)
         return
 
-    if not _column_exists(inspector, "users", "display_name"):
-        op.add_column("users", sa.Column("display_name", sa.String(length=255), nullable=True))
-    if not _column_exists(inspector, "users", "is_email_verified"):
-        # Legacy users must remain able to log in after upgrade.
-        op.add_column(
+    if _column_exists(schema, "users", "is_email_verified"):
+        op.execute(sa.text("UPDATE users SET is_email_verified = TRUE WHERE is_email_verified IS NULL"))
+    else:
+        # Legacy users must remain able to log in after upgrade. Added ahead of the batch so
+        # existing rows are backfilled with TRUE before the table rebuild flips the default.
+        _add_column(
+            schema,
             "users",
             sa.Column("is_email_verified", sa.Boolean(), nullable=False, server_default=sa.true()),
         )
-        with op.batch_alter_table("users") as batch_op:
-            batch_op.alter_column(
-                "is_email_verified",
-                existing_type=sa.Boolean(),
-                nullable=False,
-                server_default=sa.false(),
-            )
-    if not _column_exists(inspector, "users", "email_verified_at"):
-        op.add_column("users", sa.Column("email_verified_at", sa.DateTime(timezone=True), nullable=True))
-    if not _column_exists(inspector, "users", "terms_accepted_at"):
-        op.add_column("users", sa.Column("terms_accepted_at", sa.DateTime(timezone=True), nullable=True))
-    if not _column_exists(inspector, "users", "terms_accepted_ip"):
-        op.add_column("users", sa.Column("terms_accepted_ip", sa.String(length=64), nullable=True))
-
-    op.execute(sa.text("UPDATE users SET is_email_verified = TRUE WHERE is_email_verified IS NULL"))
+
+    missing_columns = [
+        column
+        for column in (
+            sa.Column("display_name", sa.String(length=255), nullable=True),
+            sa.Column("email_verified_at", sa.DateTime(timezone=True), nullable=True),
+            sa.Column("terms_accepted_at", sa.DateTime(timezone=True), nullable=True),
+            sa.Column("terms_accepted_ip", sa.String(length=64), nullable=True),
+        )
+        if not _column_exists(schema, "users", column.name)
+    ]
+
+    # One batch block: SQLite recreates the table once for all additions and the default flip.
     with op.batch_alter_table("users") as batch_op:
+        for column in missing_columns:
+            batch_op.add_column(column)
+            schema["users"].add(column.name)
         batch_op.alter_column(
             "is_email_verified",
             existing_type=sa.Boolean(),
@@ -75,9 +101,10 @@ def _ensure_user_columns(inspector: sa.Inspector) -> None:
         )
 
 
-def _ensure_lot_and_order_tables(inspector: sa.Inspector) -> None:
-    if not _table_exists(inspector, "lots"):
-        op.create_table(
+def _ensure_lot_and_order_tables(schema: SchemaSnapshot) -> None:
+    if not _table_exists(schema, "lots"):
+        _create_table(
+            schema,
             "lots",
             sa.Column("id", sa.Integer(), primary_key=True, nullable=False),
             sa.Column("name", sa.String(length=255), nullable=False),
@@ -93,8 +120,9 @@ def _ensure_lot_and_order_tables(inspector: sa.Inspector) -> None:
         op.create_index("ix_lots_id", "lots", ["id"], unique=False)
         op.create_index("ix_lots_slug", "lots", ["slug"], unique=True)
 
-    if not _table_exists(inspector, "orders"):
-        op.create_table(
+    if not _table_exists(schema, "orders"):
+        _create_table(
+            schema,
             "orders",
             sa.Column("id", sa.Integer(), primary_key=True, nullable=False),
             sa.Column("user_id", sa.Integer(), sa.ForeignKey("users.id"), nullable=False),
@@ -107,13 +135,14 @@ def _ensure_lot_and_order_tables(inspector: sa.Inspector) -> None:
             sa.Column("created_at", sa.DateTime(timezone=True), server_default=sa.func.now()),
         )
         op.create_index("ix_orders_id", "orders", ["id"], unique=False)
-    elif not _column_exists(inspector, "orders", "external_payment_id"):
-        op.add_column("orders", sa.Column("external_payment_id", sa.String(length=255), nullable=True))
+    elif not _column_exists(schema, "orders", "external_payment_id"):
+        _add_column(schema, "orders", sa.Column("external_payment_id", sa.String(length=255), nullable=True))
 
 
-def _ensure_token_tables(inspector: sa.Inspector) -> None:
-    if not _table_exists(inspector, "one_time_tokens"):
-        op.create_table(
+def _ensure_token_tables(schema: SchemaSnapshot) -> None:
+    if not _table_exists(schema, "one_time_tokens"):
+        _create_table(
+            schema,
             "one_time_tokens",
             sa.Column("id", sa.Integer(), primary_key=True, nullable=False),
             sa.Column("user_id", sa.Integer(), sa.ForeignKey("users.id"), nullable=False),
@@ -128,8 +157,9 @@ def _ensure_token_tables(inspector: sa.Inspector) -> None:
         op.create_index("ix_one_time_tokens_purpose", "one_time_tokens", ["purpose"], unique=False)
         op.create_index("ix_one_time_tokens_token_hash", "one_time_tokens", ["token_hash"], unique=True)
 
-    if not _table_exists(inspector, "refresh_tokens"):
-        op.create_table(
+    if not _table_exists(schema, "refresh_tokens"):
+        _create_table(
+            schema,
             "refresh_tokens",
             sa.Column("id", sa.Integer(), primary_key=True, nullable=False),
             sa.Column("user_id", sa.Integer(), sa.ForeignKey("users.id"), nullable=False),
@@ -147,33 +177,28 @@ def _ensure_token_tables(inspector: sa.Inspector) -> None:
 
 
 def upgrade() -> None:
-    bind = op.get_bind()
-    inspector = sa.inspect(bind)
-    _ensure_user_columns(inspector)
-    inspector = sa.inspect(bind)
-    _ensure_lot_and_order_tables(inspector)
-    inspector = sa.inspect(bind)
-    _ensure_token_tables(inspector)
+    schema = _reflect_schema(op.get_bind())
+    _ensure_user_columns(schema)
+    _ensure_lot_and_order_tables(schema)
+    _ensure_token_tables(schema)
 
 
 def downgrade() -> None:
-    bind = op.get_bind()
-    inspector = sa.inspect(bind)
+    schema = _reflect_schema(op.get_bind())
 
-    if _table_exists(inspector, "refresh_tokens"):
+    if _table_exists(schema, "refresh_tokens"):
         op.drop_table("refresh_tokens")
-    if _table_exists(inspector, "one_time_tokens"):
+    if _table_exists(schema, "one_time_tokens"):
         op.drop_table("one_time_tokens")
 
-    inspector = sa.inspect(bind)
-    if _table_exists(inspector, "users"):
-        if _column_exists(inspector, "users", "terms_accepted_ip"):
+    if _table_exists(schema, "users"):
+        if _column_exists(schema, "users", "terms_accepted_ip"):
             op.drop_column("users", "terms_accepted_ip")
-        if _column_exists(inspector, "users", "terms_accepted_at"):
+        if _column_exists(schema, "users", "terms_accepted_at"):
             op.drop_column("users", "terms_accepted_at")
-        if _column_exists(inspector, "users", "email_verified_at"):
+        if _column_exists(schema, "users", "email_verified_at"):
             op.drop_column("users", "email_verified_at")
-        if _column_exists(inspector, "users", "is_email_verified"):
+        if _column_exists(schema, "users", "is_email_verified"):
             op.drop_column("users", "is_email_verified")
-        if _column_exists(inspector, "users", "display_name"):
+        if _column_exists(schema, "users", "display_name"):
             op.drop_column("users", "display_name")
@@ -0,0 +1,41 @@
+"""users login covering index
+
+Revision ID: 20261015_01
+Revises: 20260218_01
+Create Date: 2026-10-15
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+
+
+revision: str = "20261015_01"
+down_revision: Union[str, None] = "20260218_01"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+LOGIN_INDEX_NAME = "ix_users_email_login"
+LOGIN_COLUMNS = ["id", "hashed_password", "is_email_verified", "display_name"]
+
+
+def upgrade() -> None:
+    if op.get_bind().dialect.name == "postgresql":
+        # Login reads only these columns, so Postgres can answer it with an index-only scan.
+        # CONCURRENTLY keeps users readable during the build and must run outside a transaction.
+        with op.get_context().autocommit_block():
+            op.create_index(
+                LOGIN_INDEX_NAME,
+                "users",
+                ["email"],
+                unique=True,
+                if_not_exists=True,
+                postgresql_include=LOGIN_COLUMNS,
+                postgresql_concurrently=True,
+            )
+    else:
+        op.create_index(LOGIN_INDEX_NAME, "users", ["email", *LOGIN_COLUMNS], if_not_exists=True)
+
+
+def downgrade() -> None:
+    op.drop_index(LOGIN_INDEX_NAME, table_name="users", if_exists=True)
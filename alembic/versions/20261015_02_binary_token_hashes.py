@@ -0,0 +1,76 @@
+"""store token hashes as raw sha256 digests
+
+Revision ID: 20261015_02
+Revises: 20261015_01
+Create Date: 2026-10-15
+"""
+
+from typing import Callable, Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision: str = "20261015_02"
+down_revision: Union[str, None] = "20261015_01"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+TOKEN_TABLES = ("one_time_tokens", "refresh_tokens")
+
+
+def _rewrite_token_hashes(
+    table_name: str,
+    from_type: sa.types.TypeEngine,
+    to_type: sa.types.TypeEngine,
+    convert: Callable,
+) -> None:
+    # Read values before the table rebuild, which CASTs them instead of decoding.
+    bind = op.get_bind()
+    rows = bind.execute(sa.text(f"SELECT id, token_hash FROM {table_name}")).all()
+    with op.batch_alter_table(table_name) as batch_op:
+        batch_op.alter_column("token_hash", type_=to_type, existing_type=from_type, existing_nullable=False)
+    if rows:
+        bind.execute(
+            sa.text(f"UPDATE {table_name} SET token_hash = :token_hash WHERE id = :id"),
+            [{"id": row.id, "token_hash": convert(row.token_hash)} for row in rows],
+        )
+
+
+def _alter_token_hash_type(
+    from_type: sa.types.TypeEngine,
+    to_type: sa.types.TypeEngine,
+    postgresql_using: str,
+    convert: Callable,
+) -> None:
+    is_postgres = op.get_bind().dialect.name == "postgresql"
+    for table_name in TOKEN_TABLES:
+        if is_postgres:
+            op.alter_column(
+                table_name,
+                "token_hash",
+                type_=to_type,
+                existing_type=from_type,
+                existing_nullable=False,
+                postgresql_using=postgresql_using,
+            )
+        else:
+            _rewrite_token_hashes(table_name, from_type, to_type, convert)
+
+
+def upgrade() -> None:
+    _alter_token_hash_type(
+        sa.String(length=128),
+        sa.LargeBinary(length=32),
+        "decode(token_hash, 'hex')",
+        bytes.fromhex,
+    )
+
+
+def downgrade() -> None:
+    _alter_token_hash_type(
+        sa.LargeBinary(length=32),
+        sa.String(length=128),
+        "encode(token_hash, 'hex')",
+        bytes.hex,
+    )
@@ -0,0 +1,41 @@
+"""drop indexes duplicating primary keys
+
+Revision ID: 20261015_03
+Revises: 20261015_02
+Create Date: 2026-10-15
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+
+
+revision: str = "20261015_03"
+down_revision: Union[str, None] = "20261015_02"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Every PRIMARY KEY is already backed by a unique index.
+PRIMARY_KEY_INDEXES = {
+    "ix_users_id": "users",
+    "ix_lots_id": "lots",
+    "ix_orders_id": "orders",
+    "ix_one_time_tokens_id": "one_time_tokens",
+    "ix_refresh_tokens_id": "refresh_tokens",
+}
+
+
+def upgrade() -> None:
+    if op.get_bind().dialect.name == "postgresql":
+        with op.get_context().autocommit_block():
+            for index_name, table_name in PRIMARY_KEY_INDEXES.items():
+                op.drop_index(index_name, table_name=table_name, if_exists=True, postgresql_concurrently=True)
+        return
+
+    for index_name, table_name in PRIMARY_KEY_INDEXES.items():
+        op.drop_index(index_name, table_name=table_name, if_exists=True)
+
+
+def downgrade() -> None:
+    for index_name, table_name in PRIMARY_KEY_INDEXES.items():
+        op.create_index(index_name, table_name, ["id"], unique=False, if_not_exists=True)
@@ -0,0 +1,63 @@
+"""store lot prices as integer micro-EUR
+
+Revision ID: 20261015_04
+Revises: 20261015_03
+Create Date: 2026-10-15
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision: str = "20261015_04"
+down_revision: Union[str, None] = "20261015_03"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+MICRO_EUR_PER_EUR = 1_000_000
+PRICE_COLUMNS = {
+    "price_special_eur": "price_special_micro_eur",
+    "price_nominal_eur": "price_nominal_micro_eur",
+}
+
+
+def _replace_price_columns(
+    old_columns: list[str],
+    new_columns: list[str],
+    new_type: sa.types.TypeEngine,
+    convert_sql: str,
+) -> None:
+    with op.batch_alter_table("lots") as batch_op:
+        for column_name in new_columns:
+            batch_op.add_column(sa.Column(column_name, new_type, nullable=True))
+
+    assignments = ", ".join(
+        f"{new} = {convert_sql.format(column=old)}" for old, new in zip(old_columns, new_columns)
+    )
+    op.execute(sa.text(f"UPDATE lots SET {assignments}"))
+
+    with op.batch_alter_table("lots") as batch_op:
+        for column_name in new_columns:
+            batch_op.alter_column(column_name, existing_type=new_type, nullable=False)
+        for column_name in old_columns:
+            batch_op.drop_column(column_name)
+
+
+def upgrade() -> None:
+    _replace_price_columns(
+        list(PRICE_COLUMNS),
+        list(PRICE_COLUMNS.values()),
+        sa.BigInteger(),
+        f"CAST(ROUND({{column}} * {MICRO_EUR_PER_EUR}) AS BIGINT)",
+    )
+
+
+def downgrade() -> None:
+    _replace_price_columns(
+        list(PRICE_COLUMNS.values()),
+        list(PRICE_COLUMNS),
+        sa.Numeric(10, 4),
+        f"{{column}} / {MICRO_EUR_PER_EUR}.0",
+    )
@@ -0,0 +1,45 @@
+"""partial index on active lots
+
+Revision ID: 20261015_05
+Revises: 20261015_04
+Create Date: 2026-10-15
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision: str = "20261015_05"
+down_revision: Union[str, None] = "20261015_04"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+ACTIVE_LOTS_INDEX_NAME = "ix_lots_active"
+ACTIVE_LOTS_PREDICATE = sa.text("is_active")
+
+
+def upgrade() -> None:
+    if op.get_bind().dialect.name == "postgresql":
+        with op.get_context().autocommit_block():
+            op.create_index(
+                ACTIVE_LOTS_INDEX_NAME,
+                "lots",
+                ["id"],
+                if_not_exists=True,
+                postgresql_where=ACTIVE_LOTS_PREDICATE,
+                postgresql_concurrently=True,
+            )
+    else:
+        op.create_index(
+            ACTIVE_LOTS_INDEX_NAME,
+            "lots",
+            ["id"],
+            if_not_exists=True,
+            sqlite_where=ACTIVE_LOTS_PREDICATE,
+        )
+
+
+def downgrade() -> None:
+    op.drop_index(ACTIVE_LOTS_INDEX_NAME, table_name="lots", if_exists=True)
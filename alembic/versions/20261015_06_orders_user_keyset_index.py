@@ -0,0 +1,38 @@
+"""keyset pagination index for user orders
+
+Revision ID: 20261015_06
+Revises: 20261015_05
+Create Date: 2026-10-15
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision: str = "20261015_06"
+down_revision: Union[str, None] = "20261015_05"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+USER_ORDERS_INDEX_NAME = "ix_orders_user_created"
+USER_ORDERS_INDEX_COLUMNS = ["user_id", sa.text("created_at DESC"), sa.text("id DESC")]
+
+
+def upgrade() -> None:
+    if op.get_bind().dialect.name == "postgresql":
+        with op.get_context().autocommit_block():
+            op.create_index(
+                USER_ORDERS_INDEX_NAME,
+                "orders",
+                USER_ORDERS_INDEX_COLUMNS,
+                if_not_exists=True,
+                postgresql_concurrently=True,
+            )
+    else:
+        op.create_index(USER_ORDERS_INDEX_NAME, "orders", USER_ORDERS_INDEX_COLUMNS, if_not_exists=True)
+
+
+def downgrade() -> None:
+    op.drop_index(USER_ORDERS_INDEX_NAME, table_name="orders", if_exists=True)
@@ -0,0 +1,63 @@
+"""indexes for per-user token lookups
+
+Revision ID: 20261015_07
+Revises: 20261015_06
+Create Date: 2026-10-15
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision: str = "20261015_07"
+down_revision: Union[str, None] = "20261015_06"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+ACTIVE_REFRESH_INDEX_NAME = "ix_refresh_tokens_user_active"
+ACTIVE_REFRESH_INDEX_COLUMNS = ["user_id", "expires_at"]
+ACTIVE_REFRESH_PREDICATE = sa.text("revoked_at IS NULL")
+
+LATEST_ONE_TIME_INDEX_NAME = "ix_one_time_tokens_user_purpose_created"
+LATEST_ONE_TIME_INDEX_COLUMNS = ["user_id", "purpose", sa.text("created_at DESC")]
+
+
+def upgrade() -> None:
+    if op.get_bind().dialect.name == "postgresql":
+        with op.get_context().autocommit_block():
+            op.create_index(
+                ACTIVE_REFRESH_INDEX_NAME,
+                "refresh_tokens",
+                ACTIVE_REFRESH_INDEX_COLUMNS,
+                if_not_exists=True,
+                postgresql_where=ACTIVE_REFRESH_PREDICATE,
+                postgresql_concurrently=True,
+            )
+            op.create_index(
+                LATEST_ONE_TIME_INDEX_NAME,
+                "one_time_tokens",
+                LATEST_ONE_TIME_INDEX_COLUMNS,
+                if_not_exists=True,
+                postgresql_concurrently=True,
+            )
+    else:
+        op.create_index(
+            ACTIVE_REFRESH_INDEX_NAME,
+            "refresh_tokens",
+            ACTIVE_REFRESH_INDEX_COLUMNS,
+            if_not_exists=True,
+            sqlite_where=ACTIVE_REFRESH_PREDICATE,
+        )
+        op.create_index(
+            LATEST_ONE_TIME_INDEX_NAME,
+            "one_time_tokens",
+            LATEST_ONE_TIME_INDEX_COLUMNS,
+            if_not_exists=True,
+        )
+
+
+def downgrade() -> None:
+    op.drop_index(LATEST_ONE_TIME_INDEX_NAME, table_name="one_time_tokens", if_exists=True)
+    op.drop_index(ACTIVE_REFRESH_INDEX_NAME, table_name="refresh_tokens", if_exists=True)
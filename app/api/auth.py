@@ -2,15 +2,18 @@ import logging
 from datetime import datetime, timedelta, timezone
 from typing import Annotated
 
+import bcrypt
 from fastapi import APIRouter, Depends, HTTPException, Request, status
-from jose import jwt
 from passlib.context import CryptContext
 from pydantic import BaseModel, ConfigDict, EmailStr, Field, field_validator, model_validator
+from sqlalchemy import bindparam, select, update
+from sqlalchemy.dialects import postgresql, sqlite
 from sqlalchemy.orm import Session
 
 from app.config import settings
 from app.dependencies import get_current_user
 from app.models import User, get_db
+from app.services.access_tokens import create_access_token
 from app.services.auth_tokens import (
     ONE_TIME_PURPOSE_EMAIL_VERIFY,
     ONE_TIME_PURPOSE_PASSWORD_RESET,
@@ -26,9 +29,30 @@ from app.services.auth_tokens import (
 from app.services.email_service import send_password_reset_email, send_verify_email
 
 router = APIRouter()
-pwd_context = CryptContext(schemes=["pbkdf2_sha256"], deprecated="auto")
+# argon2 is the active scheme; pbkdf2_sha256 and bcrypt hashes still verify and are upgraded on login.
+pwd_context = CryptContext(
+    schemes=["argon2", "pbkdf2_sha256"],
+    deprecated="auto",
+    argon2__time_cost=2,
+    argon2__memory_cost=65536,
+    argon2__parallelism=1,
+)
 logger = logging.getLogger(__name__)
 
+# passlib 1.7.4's bcrypt backend self-test breaks on bcrypt>=4.1, so legacy bcrypt hashes are checked directly.
+_BCRYPT_PREFIXES = ("$2a$", "$2b$", "$2y$")
+_BCRYPT_MAX_PASSWORD_BYTES = 72
+
+_DUMMY_PASSWORD_HASH = pwd_context.hash("dummy-password-never-matches")
+
+_USER_BY_EMAIL = select(User).where(User.email == bindparam("email"))
+_USER_ID_BY_EMAIL = select(User.id).where(User.email == bindparam("email"))
+# Dialects whose INSERT supports ON CONFLICT DO NOTHING ... RETURNING.
+_UPSERT_INSERTS = {"postgresql": postgresql.insert, "sqlite": sqlite.insert}
+_LOGIN_BY_EMAIL = select(User.id, User.hashed_password, User.is_email_verified).where(
+    User.email == bindparam("email")
+)
+
 
 class AuthSchema(BaseModel):
     model_config = ConfigDict(populate_by_name=True)
@@ -140,22 +164,26 @@ def verify_password(plain: str, hashed: str) -> bool:
     return pwd_context.verify(plain, hashed)
 
 
-def get_password_hash(password: str) -> str:
-    return pwd_context.hash(password)
+def verify_and_update_password(plain: str, hashed: str) -> tuple[bool, str | None]:
+    """Verify password and return a replacement hash when the stored one uses a deprecated scheme."""
+    if hashed.startswith(_BCRYPT_PREFIXES):
+        secret = plain.encode("utf-8")[:_BCRYPT_MAX_PASSWORD_BYTES]
+        if not bcrypt.checkpw(secret, hashed.encode("ascii")):
+            return False, None
+        return True, pwd_context.hash(plain)
+    return pwd_context.verify_and_update(plain, hashed)
 
 
-def create_access_token(user_id: int) -> str:
-    expire = datetime.now(timezone.utc) + timedelta(minutes=settings.JWT_EXPIRE_MINUTES)
-    to_encode = {"sub": str(user_id), "exp": expire, "type": "access"}
-    return jwt.encode(to_encode, settings.JWT_SECRET, algorithm=settings.JWT_ALGORITHM)
+def get_password_hash(password: str) -> str:
+    return pwd_context.hash(password)
 
 
 def _build_token_response(access_token: str, refresh_token: str) -> TokenResponse:
-    return TokenResponse(
-        accessToken=access_token,
-        refreshToken=refresh_token,
-        expiresIn=settings.JWT_EXPIRE_MINUTES * 60,
-        refreshExpiresIn=settings.JWT_REFRESH_EXPIRE_DAYS * 24 * 60 * 60,
+    return TokenResponse.model_construct(
+        access_token=access_token,
+        refresh_token=refresh_token,
+        expires_in=settings.JWT_EXPIRE_MINUTES * 60,
+        refresh_expires_in=settings.JWT_REFRESH_EXPIRE_DAYS * 24 * 60 * 60,
     )
 
 
@@ -178,6 +206,26 @@ def _get_user_agent(request: Request) -> str | None:
     return user_agent[:512]
 
 
+def _insert_user_if_absent(db: Session, **values) -> int | None:
+    """Insert a user and return its id, or None when the email is already registered."""
+    insert = _UPSERT_INSERTS.get(db.get_bind().dialect.name)
+    if insert is not None:
+        stmt = (
+            insert(User)
+            .values(**values)
+            .on_conflict_do_nothing(index_elements=[User.email])
+            .returning(User.id)
+        )
+        return db.scalar(stmt)
+
+    if db.scalars(_USER_ID_BY_EMAIL, {"email": values["email"]}).first() is not None:
+        return None
+    user = User(**values)
+    db.add(user)
+    db.flush()
+    return user.id
+
+
 @router.post(
     "/register",
     response_model=RegisterResponse,
@@ -189,13 +237,8 @@ def register(
     db: Annotated[Session, Depends(get_db)],
 ):
     """Register a new user and send email verification link."""
-    if db.query(User).filter(User.email == body.email).first():
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail="Email already registered",
-        )
-
-    user = User(
+    user_id = _insert_user_if_absent(
+        db,
         display_name=body.display_name,
         email=body.email,
         hashed_password=get_password_hash(body.password),
@@ -203,35 +246,37 @@ def register(
         terms_accepted_at=utcnow(),
         terms_accepted_ip=_get_client_ip(request),
     )
-    db.add(user)
-    db.flush()
+    if user_id is None:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Email already registered",
+        )
 
     verify_token, _ = issue_one_time_token(
         db=db,
-        user_id=user.id,
+        user_id=user_id,
         purpose=ONE_TIME_PURPOSE_EMAIL_VERIFY,
         expires_in_minutes=settings.EMAIL_VERIFY_TOKEN_EXPIRE_MINUTES,
     )
 
     try:
-        send_verify_email(user.email, user.display_name, verify_token)
+        send_verify_email(body.email, body.display_name, verify_token)
     except Exception:
         db.rollback()
-        logger.exception("Failed to send verification email to user id=%s", user.id)
+        logger.exception("Failed to send verification email to user id=%s", user_id)
         raise HTTPException(
             status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
             detail="Unable to send verification email",
         )
 
     db.commit()
-    db.refresh(user)
-
-    return RegisterResponse(
-        id=user.id,
-        email=user.email,
-        displayName=user.display_name,
-        isEmailVerified=user.is_email_verified,
-        requiresEmailVerification=True,
+
+    return RegisterResponse.model_construct(
+        id=user_id,
+        email=body.email,
+        display_name=body.display_name,
+        is_email_verified=False,
+        requires_email_verification=True,
     )
 
 
@@ -246,8 +291,14 @@ def login(
     db: Annotated[Session, Depends(get_db)],
 ):
     """Login with email/password and return JWT access + opaque refresh token."""
-    user = db.query(User).filter(User.email == body.email).first()
-    if not user or not verify_password(body.password, user.hashed_password):
+    user = db.execute(_LOGIN_BY_EMAIL, {"email": body.email}).first()
+    if user is None:
+        # Pay the same hashing cost as a real account so unknown emails are not cheaper to probe.
+        verify_password(body.password, _DUMMY_PASSWORD_HASH)
+        verified, upgraded_hash = False, None
+    else:
+        verified, upgraded_hash = verify_and_update_password(body.password, user.hashed_password)
+    if not verified:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Incorrect email or password",
@@ -258,6 +309,9 @@ def login(
             detail="Email is not verified",
         )
 
+    if upgraded_hash:
+        db.execute(update(User).where(User.id == user.id).values(hashed_password=upgraded_hash))
+
     access_token = create_access_token(user.id)
     refresh_token, _ = issue_refresh_token(
         db=db,
@@ -281,7 +335,7 @@ def request_email_verification(
     db: Annotated[Session, Depends(get_db)],
 ):
     """Resend verification email (generic success response for privacy)."""
-    user = db.query(User).filter(User.email == body.email).first()
+    user = db.scalars(_USER_BY_EMAIL, {"email": body.email}).first()
     generic = MessageResponse(message="If the account exists, a verification email has been sent.")
     if not user or user.is_email_verified:
         return generic
@@ -325,7 +379,7 @@ def confirm_email_verification(
             detail="Invalid or expired verification token",
         )
 
-    user = db.query(User).filter(User.id == token.user_id).first()
+    user = db.get(User, token.user_id)
     if not user:
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="User not found")
 
@@ -361,7 +415,7 @@ def refresh_tokens(
         )
 
     user_id, new_refresh = rotated
-    user = db.query(User).filter(User.id == user_id).first()
+    user = db.get(User, user_id)
     if not user:
         db.rollback()
         raise HTTPException(
@@ -369,9 +423,9 @@ def refresh_tokens(
             detail="Invalid refresh token",
         )
 
+    access_token = create_access_token(user.id)
     db.commit()
 
-    access_token = create_access_token(user.id)
     return _build_token_response(access_token, new_refresh)
 
 
@@ -400,7 +454,7 @@ def request_password_reset(
     db: Annotated[Session, Depends(get_db)],
 ):
     """Issue password reset token and send email (privacy-safe response)."""
-    user = db.query(User).filter(User.email == body.email).first()
+    user = db.scalars(_USER_BY_EMAIL, {"email": body.email}).first()
     generic = MessageResponse(message="If the account exists, a reset email has been sent.")
     if not user:
         return generic
@@ -441,7 +495,7 @@ def reset_password(
             detail="Invalid or expired reset token",
         )
 
-    user = db.query(User).filter(User.id == token.user_id).first()
+    user = db.get(User, token.user_id)
     if not user:
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="User not found")
 
@@ -461,10 +515,10 @@ def me(
 ):
     """Return profile of the authenticated user."""
     created = current_user.created_at.isoformat() if current_user.created_at else ""
-    return MeResponse(
+    return MeResponse.model_construct(
         id=current_user.id,
         email=current_user.email,
-        displayName=current_user.display_name,
-        isEmailVerified=current_user.is_email_verified,
-        createdAt=created,
+        display_name=current_user.display_name,
+        is_email_verified=current_user.is_email_verified,
+        created_at=created,
     )
@@ -1,45 +1,98 @@
+import hashlib
+import time
 from typing import Annotated
 
-from fastapi import APIRouter, Depends, HTTPException, status
+import orjson
+from fastapi import APIRouter, Depends, HTTPException, Request, Response, status
+from fastapi.responses import ORJSONResponse
+from sqlalchemy import case, func, select
 from sqlalchemy.orm import Session
 
 from app.config import settings
 from app.models import Lot, get_db
+from app.models.lot import format_micro_eur
 from app.schemas.lots import LotDetailResponse, LotListResponse
 
 router = APIRouter()
 
+_REMAINING_SPECIAL_FRACTIONS = case(
+    (Lot.sold_special_fractions >= Lot.special_price_fractions_cap, 0),
+    else_=Lot.special_price_fractions_cap - Lot.sold_special_fractions,
+).label("remaining_special_fractions")
 
-def lot_to_list_response(lot: Lot) -> LotListResponse:
-    remaining = max(0, lot.special_price_fractions_cap - lot.sold_special_fractions)
-    return LotListResponse(
-        id=lot.id,
-        name=lot.name,
-        slug=lot.slug,
-        total_fractions=lot.total_fractions,
-        special_price_fractions_cap=lot.special_price_fractions_cap,
-        remaining_special_fractions=remaining,
-        price_special_eur=lot.price_special_eur,
-        price_nominal_eur=lot.price_nominal_eur,
-        min_fractions_to_buy=settings.MIN_FRACTIONS,
-        is_active=lot.is_active,
-    )
-
-
-def lot_to_detail_response(lot: Lot) -> LotDetailResponse:
-    remaining = max(0, lot.special_price_fractions_cap - lot.sold_special_fractions)
-    return LotDetailResponse(
-        id=lot.id,
-        name=lot.name,
-        slug=lot.slug,
-        total_fractions=lot.total_fractions,
-        special_price_fractions_cap=lot.special_price_fractions_cap,
-        remaining_special_fractions=remaining,
-        price_special_eur=lot.price_special_eur,
-        price_nominal_eur=lot.price_nominal_eur,
-        min_fractions_to_buy=settings.MIN_FRACTIONS,
-        is_active=lot.is_active,
-    )
+_ACTIVE_LOTS_STMT = select(
+    Lot.id,
+    Lot.name,
+    Lot.slug,
+    Lot.total_fractions,
+    Lot.special_price_fractions_cap,
+    _REMAINING_SPECIAL_FRACTIONS,
+    Lot.price_special_micro_eur,
+    Lot.price_nominal_micro_eur,
+    Lot.is_active,
+).where(Lot.is_active.is_(True))
+
+# Cheap fingerprint of the active lots; any purchase or added/removed lot changes it.
+_LOTS_VERSION_STMT = select(
+    func.count(Lot.id),
+    func.max(Lot.id),
+    func.coalesce(func.sum(Lot.sold_special_fractions), 0),
+).where(Lot.is_active.is_(True))
+
+# version key -> (expires_at monotonic, JSON body, ETag)
+_lots_cache: dict[tuple, tuple[float, bytes, str]] = {}
+
+
+def _etag(body: bytes) -> str:
+    return f'"{hashlib.blake2b(body, digest_size=16).hexdigest()}"'
+
+
+def _lot_payload(row, min_fractions: int) -> dict:
+    """Build the LotListResponse/LotDetailResponse JSON shape from an _ACTIVE_LOTS_STMT row."""
+    return {
+        "id": row.id,
+        "name": row.name,
+        "slug": row.slug,
+        "total_fractions": row.total_fractions,
+        "special_price_fractions_cap": row.special_price_fractions_cap,
+        "remaining_special_fractions": row.remaining_special_fractions,
+        "price_special_eur": format_micro_eur(row.price_special_micro_eur),
+        "price_nominal_eur": format_micro_eur(row.price_nominal_micro_eur),
+        "min_fractions_to_buy": min_fractions,
+        "is_active": row.is_active,
+    }
+
+
+def _render_lots(db: Session, min_fractions: int) -> bytes:
+    # Plain dicts straight to orjson: no per-row model instance on this hot path.
+    return orjson.dumps([_lot_payload(row, min_fractions) for row in db.execute(_ACTIVE_LOTS_STMT)])
+
+
+def _get_lots_body(db: Session) -> tuple[bytes, str]:
+    min_fractions = settings.MIN_FRACTIONS
+    ttl = settings.LOTS_CACHE_TTL_SECONDS
+    if ttl <= 0:
+        body = _render_lots(db, min_fractions)
+        return body, _etag(body)
+
+    key = (min_fractions, *db.execute(_LOTS_VERSION_STMT).one())
+    now = time.monotonic()
+    cached = _lots_cache.get(key)
+    if cached and cached[0] > now:
+        return cached[1], cached[2]
+
+    body = _render_lots(db, min_fractions)
+    etag = _etag(body)
+    _lots_cache.clear()
+    _lots_cache[key] = (now + ttl, body, etag)
+    return body, etag
+
+
+def _etag_matches(if_none_match: str | None, etag: str) -> bool:
+    if not if_none_match:
+        return False
+    candidates = {candidate.strip().removeprefix("W/") for candidate in if_none_match.split(",")}
+    return "*" in candidates or etag in candidates
 
 
 @router.get(
@@ -48,11 +101,15 @@ def lot_to_detail_response(lot: Lot) -> LotDetailResponse:
     summary="List all lots",
 )
 def list_lots(
+    request: Request,
     db: Annotated[Session, Depends(get_db)],
 ):
     """Returns all active lots with remaining special fractions and prices."""
-    lots = db.query(Lot).filter(Lot.is_active == True).all()
-    return [lot_to_list_response(lot) for lot in lots]
+    body, etag = _get_lots_body(db)
+    headers = {"ETag": etag}
+    if _etag_matches(request.headers.get("if-none-match"), etag):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+    return Response(content=body, media_type="application/json", headers=headers)
 
 
 @router.get(
@@ -65,7 +122,7 @@ def get_lot(
     db: Annotated[Session, Depends(get_db)],
 ):
     """Returns one lot with full details for the object card (remaining fractions, prices, limits)."""
-    lot = db.query(Lot).filter(Lot.id == lot_id, Lot.is_active == True).first()
-    if not lot:
+    row = db.execute(_ACTIVE_LOTS_STMT.where(Lot.id == lot_id)).first()
+    if not row:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Lot not found")
-    return lot_to_detail_response(lot)
+    return ORJSONResponse(_lot_payload(row, settings.MIN_FRACTIONS))
@@ -1,15 +1,22 @@
-from decimal import Decimal
+import base64
+import binascii
+from datetime import datetime
 from typing import Annotated
 
-from fastapi import APIRouter, Depends, HTTPException, status
+import orjson
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from fastapi.responses import StreamingResponse
+from sqlalchemy import bindparam, delete, insert, select, tuple_
 from sqlalchemy.orm import Session
 
 from app.config import settings
-from app.dependencies import get_current_user
+from app.dependencies import get_current_user, get_current_user_id
 from app.models import Lot, Order, User, get_db
+from app.models.lot import MICRO_EUR_PER_CENT
 from app.schemas.orders import (
     OrderCreateRequest,
     OrderCreateResponse,
+    OrderListResponse,
     OrderResponse,
     OrderStatusResponse,
     PaymentMethodsResponse,
@@ -19,6 +26,59 @@ from app.services.url_utils import validate_checkout_redirect_url
 
 router = APIRouter()
 
+ORDERS_STREAM_BATCH_SIZE = 500
+
+# Only the columns create_order needs; the webhook re-checks availability under a row lock at payment time.
+_ORDERABLE_LOT_STMT = select(
+    Lot.id,
+    Lot.name,
+    Lot.price_special_micro_eur,
+    (Lot.special_price_fractions_cap - Lot.sold_special_fractions).label("remaining_special_fractions"),
+).where(Lot.id == bindparam("lot_id"), Lot.is_active.is_(True))
+
+# Column projections: rows go straight into response models, so no ORM instances are hydrated.
+_MY_ORDERS_STMT = (
+    select(
+        Order.id,
+        Order.lot_id,
+        Lot.name.label("lot_name"),
+        Order.fraction_count,
+        Order.amount_eur_cents,
+        Order.payment_method,
+        Order.status,
+        Order.created_at,
+    )
+    .join(Lot, Lot.id == Order.lot_id)
+    .where(Order.user_id == bindparam("user_id"))
+)
+_ORDER_STATUS_STMT = select(
+    Order.id,
+    Order.status,
+    Order.fraction_count,
+    Order.amount_eur_cents,
+).where(Order.id == bindparam("order_id"), Order.user_id == bindparam("user_id"))
+
+
+def _encode_order_cursor(created_at: datetime, order_id: int) -> str:
+    raw = f"{created_at.isoformat()}|{order_id}".encode("utf-8")
+    return base64.urlsafe_b64encode(raw).rstrip(b"=").decode("ascii")
+
+
+def _decode_order_cursor(cursor: str) -> tuple[datetime, int]:
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)).decode("utf-8")
+        created_at, order_id = raw.rsplit("|", 1)
+        return datetime.fromisoformat(created_at), int(order_id)
+    except (binascii.Error, UnicodeDecodeError, ValueError):
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid cursor")
+
+
+def _discard_pending_order(db: Session, order_id: int) -> None:
+    """Remove an order whose checkout could not be created; it never reached a payment provider."""
+    db.rollback()
+    db.execute(delete(Order).where(Order.id == order_id, Order.status == "pending"))
+    db.commit()
+
 
 @router.get(
     "/payment-methods",
@@ -60,17 +120,18 @@ def create_order(
             detail=f"Payment method {body.payment_method} is currently unavailable",
         )
 
-    lot = db.query(Lot).filter(Lot.id == body.lot_id, Lot.is_active == True).first()
-    if not lot:
-        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Lot not found")
-
-    remaining = max(0, lot.special_price_fractions_cap - lot.sold_special_fractions)
     min_f = settings.MIN_FRACTIONS
     if body.fraction_count < min_f:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail=f"Minimum {min_f} fractions required",
         )
+
+    lot = db.execute(_ORDERABLE_LOT_STMT, {"lot_id": body.lot_id}).first()
+    if not lot:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Lot not found")
+
+    remaining = max(0, lot.remaining_special_fractions)
     if body.fraction_count > remaining:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
@@ -85,24 +146,27 @@ def create_order(
     if body.cancel_url:
         cancel_url = validate_checkout_redirect_url(body.cancel_url, "cancel_url")
 
-    # Use Decimal for precise conversion to cents.
-    price_special_decimal = Decimal(str(lot.price_special_eur))
-    amount_eur_cents = int(price_special_decimal * Decimal("100") * Decimal(str(body.fraction_count)))
+    # Exact integer math; fractions of a cent are truncated as before.
+    amount_eur_cents = lot.price_special_micro_eur * body.fraction_count // MICRO_EUR_PER_CENT
 
-    order = Order(
-        user_id=current_user.id,
-        lot_id=lot.id,
-        fraction_count=body.fraction_count,
-        amount_eur_cents=amount_eur_cents,
-        payment_method=body.payment_method,
-        status="pending",
+    order_id = db.scalar(
+        insert(Order)
+        .values(
+            user_id=current_user.id,
+            lot_id=lot.id,
+            fraction_count=body.fraction_count,
+            amount_eur_cents=amount_eur_cents,
+            payment_method=body.payment_method,
+            status="pending",
+        )
+        .returning(Order.id)
     )
-    db.add(order)
-    db.flush()
+    # Commit before the gateway round trip so no connection or transaction is held while it runs.
+    db.commit()
 
     try:
         result = gateway.create_checkout(
-            order_id=order.id,
+            order_id=order_id,
             amount_eur_cents=amount_eur_cents,
             fraction_count=body.fraction_count,
             lot_name=lot.name,
@@ -110,29 +174,27 @@ def create_order(
             cancel_url=cancel_url,
         )
     except ValueError as e:
-        db.rollback()
+        _discard_pending_order(db, order_id)
         raise HTTPException(status_code=status.HTTP_503_SERVICE_UNAVAILABLE, detail=str(e))
     except HTTPException:
-        db.rollback()
+        _discard_pending_order(db, order_id)
         raise
     except Exception:
-        db.rollback()
+        _discard_pending_order(db, order_id)
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail="Failed to create checkout session",
         )
 
     if not result.checkout_url:
-        db.rollback()
+        _discard_pending_order(db, order_id)
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail="Failed to create checkout session",
         )
 
-    db.commit()
-
     return OrderCreateResponse(
-        order_id=order.id,
+        order_id=order_id,
         checkout_url=result.checkout_url,
         session_id=result.session_id,
         payment_method=body.payment_method,
@@ -141,27 +203,89 @@ def create_order(
 
 @router.get(
     "/me",
-    response_model=list[OrderResponse],
+    response_model=OrderListResponse,
     summary="List my orders",
 )
 def my_orders(
-    current_user: Annotated[User, Depends(get_current_user)],
+    current_user_id: Annotated[int, Depends(get_current_user_id)],
     db: Annotated[Session, Depends(get_db)],
+    cursor: str | None = None,
+    limit: Annotated[int, Query(ge=1, le=100)] = 20,
 ):
-    """Returns the list of orders for the current user."""
-    orders = db.query(Order).filter(Order.user_id == current_user.id).order_by(Order.created_at.desc()).all()
-    return [
-        OrderResponse(
-            id=o.id,
-            lot_id=o.lot_id,
-            fraction_count=o.fraction_count,
-            amount_eur_cents=o.amount_eur_cents,
-            payment_method=o.payment_method,
-            status=o.status,
-            created_at=o.created_at.isoformat() if o.created_at else "",
-        )
-        for o in orders
-    ]
+    """Returns one page of the current user's orders, newest first; pass next_cursor to get the next page."""
+    stmt = _MY_ORDERS_STMT
+    if cursor:
+        created_at, order_id = _decode_order_cursor(cursor)
+        stmt = stmt.where(tuple_(Order.created_at, Order.id) < tuple_(created_at, order_id))
+    # One extra row tells whether another page exists without a COUNT query.
+    rows = db.execute(
+        stmt.order_by(Order.created_at.desc(), Order.id.desc()).limit(limit + 1),
+        {"user_id": current_user_id},
+    ).all()
+
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        next_cursor = _encode_order_cursor(rows[-1].created_at, rows[-1].id)
+
+    # Rows come straight from the database, so the per-row models skip validation.
+    return OrderListResponse.model_construct(
+        data=[
+            OrderResponse.model_construct(
+                id=row.id,
+                lot_id=row.lot_id,
+                lot_name=row.lot_name,
+                fraction_count=row.fraction_count,
+                amount_eur_cents=row.amount_eur_cents,
+                payment_method=row.payment_method,
+                status=row.status,
+                created_at=row.created_at,
+            )
+            for row in rows
+        ],
+        next_cursor=next_cursor,
+    )
+
+
+@router.get(
+    "/me/stream",
+    summary="Stream all my orders as NDJSON",
+    response_class=StreamingResponse,
+)
+def my_orders_stream(
+    current_user_id: Annotated[int, Depends(get_current_user_id)],
+    db: Annotated[Session, Depends(get_db)],
+):
+    """Streams every order of the current user, newest first, one JSON object per line."""
+
+    def rows():
+        # get_db has already closed the session by the time the body streams; it reconnects
+        # lazily here and is closed again once the last batch is sent.
+        try:
+            result = db.execute(
+                _MY_ORDERS_STMT.order_by(Order.created_at.desc(), Order.id.desc()),
+                {"user_id": current_user_id},
+                execution_options={"yield_per": ORDERS_STREAM_BATCH_SIZE},
+            )
+            for row in result:
+                yield orjson.dumps(
+                    {
+                        "id": row.id,
+                        "lot_id": row.lot_id,
+                        "lot_name": row.lot_name,
+                        "fraction_count": row.fraction_count,
+                        "amount_eur_cents": row.amount_eur_cents,
+                        "payment_method": row.payment_method,
+                        "status": row.status,
+                        "created_at": row.created_at,
+                    },
+                    # UTC as "Z", matching how pydantic renders created_at in the paginated list.
+                    option=orjson.OPT_APPEND_NEWLINE | orjson.OPT_UTC_Z,
+                )
+        finally:
+            db.close()
+
+    return StreamingResponse(rows(), media_type="application/x-ndjson")
 
 
 @router.get(
@@ -171,14 +295,14 @@ def my_orders(
 )
 def order_status(
     order_id: int,
-    current_user: Annotated[User, Depends(get_current_user)],
+    current_user_id: Annotated[int, Depends(get_current_user_id)],
     db: Annotated[Session, Depends(get_db)],
 ):
     """Returns status of an order (only for the current user's orders)."""
-    order = db.query(Order).filter(Order.id == order_id, Order.user_id == current_user.id).first()
+    order = db.execute(_ORDER_STATUS_STMT, {"order_id": order_id, "user_id": current_user_id}).first()
     if not order:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Order not found")
-    return OrderStatusResponse(
+    return OrderStatusResponse.model_construct(
         id=order.id,
         status=order.status,
         fraction_count=order.fraction_count,
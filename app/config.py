@@ -1,144 +1,116 @@
 import os
+from dataclasses import dataclass
 
+_TRUE_VALUES = frozenset({"1", "true", "yes", "on"})
 
-class Settings:
-    @staticmethod
-    def _get_int(name: str, default: int) -> int:
-        return int(os.getenv(name, str(default)))
-
-    @staticmethod
-    def _get_bool(name: str, default: bool) -> bool:
-        raw = os.getenv(name)
-        if raw is None:
-            return default
-        return raw.strip().lower() in {"1", "true", "yes", "on"}
-
-    @property
-    def BASE_URL(self) -> str:
-        return os.getenv("BASE_URL", "http://localhost:8000")
-
-    @property
-    def FRONTEND_URL(self) -> str:
-        return os.getenv("FRONTEND_URL", "http://localhost:3000")
-
-    @property
-    def EMAIL_VERIFY_PATH(self) -> str:
-        return os.getenv("EMAIL_VERIFY_PATH", "/verify-email")
-
-    @property
-    def PASSWORD_RESET_PATH(self) -> str:
-        return os.getenv("PASSWORD_RESET_PATH", "/restore-password")
-
-    @property
-    def DATABASE_URL(self) -> str:
-        database_url = os.getenv("DATABASE_URL", "").strip()
-        if not database_url:
-            raise ValueError("DATABASE_URL is required")
-        return database_url
-
-    @property
-    def JWT_SECRET(self) -> str:
-        return os.getenv("JWT_SECRET", "change-me-in-production")
-
-    @property
-    def JWT_ALGORITHM(self) -> str:
-        return os.getenv("JWT_ALGORITHM", "HS256")
-
-    @property
-    def JWT_EXPIRE_MINUTES(self) -> int:
-        return self._get_int("JWT_EXPIRE_MINUTES", 60)
-
-    @property
-    def JWT_REFRESH_EXPIRE_DAYS(self) -> int:
-        return self._get_int("JWT_REFRESH_EXPIRE_DAYS", 30)
-
-    @property
-    def EMAIL_VERIFY_TOKEN_EXPIRE_MINUTES(self) -> int:
-        return self._get_int("EMAIL_VERIFY_TOKEN_EXPIRE_MINUTES", 60 * 24)
-
-    @property
-    def PASSWORD_RESET_TOKEN_EXPIRE_MINUTES(self) -> int:
-        return self._get_int("PASSWORD_RESET_TOKEN_EXPIRE_MINUTES", 30)
-
-    @property
-    def EMAIL_RESEND_COOLDOWN_SECONDS(self) -> int:
-        return self._get_int("EMAIL_RESEND_COOLDOWN_SECONDS", 60)
-
-    @property
-    def SMTP_HOST(self) -> str:
-        return os.getenv("SMTP_HOST", "").strip()
 
-    @property
-    def SMTP_PORT(self) -> int:
-        return self._get_int("SMTP_PORT", 587)
-
-    @property
-    def SMTP_USER(self) -> str:
-        return os.getenv("SMTP_USER", "").strip()
-
-    @property
-    def SMTP_PASSWORD(self) -> str:
-        return os.getenv("SMTP_PASSWORD", "").strip()
-
-    @property
-    def SMTP_FROM_EMAIL(self) -> str:
-        return os.getenv("SMTP_FROM_EMAIL", "").strip()
-
-    @property
-    def SMTP_FROM_NAME(self) -> str:
-        return os.getenv("SMTP_FROM_NAME", "Marketplace API").strip()
-
-    @property
-    def SMTP_USE_TLS(self) -> bool:
-        return self._get_bool("SMTP_USE_TLS", True)
-
-    @property
-    def STRIPE_SECRET_KEY(self) -> str:
-        return os.getenv("STRIPE_SECRET_KEY", "")
-
-    @property
-    def STRIPE_WEBHOOK_SECRET(self) -> str:
-        return os.getenv("STRIPE_WEBHOOK_SECRET", "")
+def _get_str(name: str, default: str = "", strip: bool = False) -> str:
+    value = os.getenv(name, default)
+    return value.strip() if strip else value
 
-    @property
-    def STRIPE_SUCCESS_URL(self) -> str:
-        return os.getenv("STRIPE_SUCCESS_URL", "http://localhost:3000/success")
-
-    @property
-    def STRIPE_CANCEL_URL(self) -> str:
-        return os.getenv("STRIPE_CANCEL_URL", "http://localhost:3000/cancel")
 
-    @property
-    def PAYKILLA_API_KEY(self) -> str:
-        return os.getenv("PAYKILLA_API_KEY", "")
+def _get_int(name: str, default: int) -> int:
+    return int(os.getenv(name, str(default)))
 
-    @property
-    def PAYKILLA_WEBHOOK_SECRET(self) -> str:
-        return os.getenv("PAYKILLA_WEBHOOK_SECRET", "")
 
-    @property
-    def PAYKILLA_SUCCESS_URL(self) -> str:
-        return os.getenv("PAYKILLA_SUCCESS_URL", "http://localhost:3000/success")
+def _get_bool(name: str, default: bool) -> bool:
+    raw = os.getenv(name)
+    if raw is None:
+        return default
+    return raw.strip().lower() in _TRUE_VALUES
 
-    @property
-    def PAYKILLA_CANCEL_URL(self) -> str:
-        return os.getenv("PAYKILLA_CANCEL_URL", "http://localhost:3000/cancel")
 
-    @property
-    def MIN_FRACTIONS(self) -> int:
-        return self._get_int("MIN_FRACTIONS", 1)
-
-    @property
-    def CORS_ORIGINS(self) -> str:
-        return os.getenv("CORS_ORIGINS", "http://localhost:3000,http://localhost:3001")
-
-    @property
-    def DB_CONNECT_RETRIES(self) -> int:
-        return self._get_int("DB_CONNECT_RETRIES", 10)
+@dataclass(slots=True)
+class Settings:
+    """Environment configuration, parsed once so request paths read plain attributes."""
+
+    BASE_URL: str
+    FRONTEND_URL: str
+    EMAIL_VERIFY_PATH: str
+    PASSWORD_RESET_PATH: str
+    database_url: str
+    JWT_SECRET: str
+    JWT_ALGORITHM: str
+    JWT_EXPIRE_MINUTES: int
+    JWT_REFRESH_EXPIRE_DAYS: int
+    EMAIL_VERIFY_TOKEN_EXPIRE_MINUTES: int
+    PASSWORD_RESET_TOKEN_EXPIRE_MINUTES: int
+    EMAIL_RESEND_COOLDOWN_SECONDS: int
+    SMTP_HOST: str
+    SMTP_PORT: int
+    SMTP_USER: str
+    SMTP_PASSWORD: str
+    SMTP_FROM_EMAIL: str
+    SMTP_FROM_NAME: str
+    SMTP_USE_TLS: bool
+    SMTP_POOL_SIZE: int
+    STRIPE_SECRET_KEY: str
+    STRIPE_WEBHOOK_SECRET: str
+    STRIPE_SUCCESS_URL: str
+    STRIPE_CANCEL_URL: str
+    PAYKILLA_API_KEY: str
+    PAYKILLA_WEBHOOK_SECRET: str
+    PAYKILLA_SUCCESS_URL: str
+    PAYKILLA_CANCEL_URL: str
+    MIN_FRACTIONS: int
+    LOTS_CACHE_TTL_SECONDS: int
+    CORS_ORIGINS: str
+    DB_CONNECT_RETRIES: int
+    DB_CONNECT_RETRY_DELAY_SECONDS: int
+    DB_POOL_SIZE: int
+    DB_MAX_OVERFLOW: int
+    DB_POOL_TIMEOUT_SECONDS: int
+    DB_POOL_RECYCLE_SECONDS: int
+    DB_PGBOUNCER: bool
+
+    @classmethod
+    def from_env(cls) -> "Settings":
+        return cls(
+            BASE_URL=_get_str("BASE_URL", "http://localhost:8000"),
+            FRONTEND_URL=_get_str("FRONTEND_URL", "http://localhost:3000"),
+            EMAIL_VERIFY_PATH=_get_str("EMAIL_VERIFY_PATH", "/verify-email"),
+            PASSWORD_RESET_PATH=_get_str("PASSWORD_RESET_PATH", "/restore-password"),
+            database_url=_get_str("DATABASE_URL", strip=True),
+            JWT_SECRET=_get_str("JWT_SECRET", "change-me-in-production"),
+            JWT_ALGORITHM=_get_str("JWT_ALGORITHM", "HS256"),
+            JWT_EXPIRE_MINUTES=_get_int("JWT_EXPIRE_MINUTES", 60),
+            JWT_REFRESH_EXPIRE_DAYS=_get_int("JWT_REFRESH_EXPIRE_DAYS", 30),
+            EMAIL_VERIFY_TOKEN_EXPIRE_MINUTES=_get_int("EMAIL_VERIFY_TOKEN_EXPIRE_MINUTES", 60 * 24),
+            PASSWORD_RESET_TOKEN_EXPIRE_MINUTES=_get_int("PASSWORD_RESET_TOKEN_EXPIRE_MINUTES", 30),
+            EMAIL_RESEND_COOLDOWN_SECONDS=_get_int("EMAIL_RESEND_COOLDOWN_SECONDS", 60),
+            SMTP_HOST=_get_str("SMTP_HOST", strip=True),
+            SMTP_PORT=_get_int("SMTP_PORT", 587),
+            SMTP_USER=_get_str("SMTP_USER", strip=True),
+            SMTP_PASSWORD=_get_str("SMTP_PASSWORD", strip=True),
+            SMTP_FROM_EMAIL=_get_str("SMTP_FROM_EMAIL", strip=True),
+            SMTP_FROM_NAME=_get_str("SMTP_FROM_NAME", "Marketplace API", strip=True),
+            SMTP_USE_TLS=_get_bool("SMTP_USE_TLS", True),
+            SMTP_POOL_SIZE=_get_int("SMTP_POOL_SIZE", 2),
+            STRIPE_SECRET_KEY=_get_str("STRIPE_SECRET_KEY"),
+            STRIPE_WEBHOOK_SECRET=_get_str("STRIPE_WEBHOOK_SECRET"),
+            STRIPE_SUCCESS_URL=_get_str("STRIPE_SUCCESS_URL", "http://localhost:3000/success"),
+            STRIPE_CANCEL_URL=_get_str("STRIPE_CANCEL_URL", "http://localhost:3000/cancel"),
+            PAYKILLA_API_KEY=_get_str("PAYKILLA_API_KEY"),
+            PAYKILLA_WEBHOOK_SECRET=_get_str("PAYKILLA_WEBHOOK_SECRET"),
+            PAYKILLA_SUCCESS_URL=_get_str("PAYKILLA_SUCCESS_URL", "http://localhost:3000/success"),
+            PAYKILLA_CANCEL_URL=_get_str("PAYKILLA_CANCEL_URL", "http://localhost:3000/cancel"),
+            MIN_FRACTIONS=_get_int("MIN_FRACTIONS", 1),
+            LOTS_CACHE_TTL_SECONDS=_get_int("LOTS_CACHE_TTL_SECONDS", 10),
+            CORS_ORIGINS=_get_str("CORS_ORIGINS", "http://localhost:3000,http://localhost:3001"),
+            DB_CONNECT_RETRIES=_get_int("DB_CONNECT_RETRIES", 10),
+            DB_CONNECT_RETRY_DELAY_SECONDS=_get_int("DB_CONNECT_RETRY_DELAY_SECONDS", 1),
+            DB_POOL_SIZE=_get_int("DB_POOL_SIZE", 20),
+            DB_MAX_OVERFLOW=_get_int("DB_MAX_OVERFLOW", 40),
+            DB_POOL_TIMEOUT_SECONDS=_get_int("DB_POOL_TIMEOUT_SECONDS", 30),
+            DB_POOL_RECYCLE_SECONDS=_get_int("DB_POOL_RECYCLE_SECONDS", 3600),
+            DB_PGBOUNCER=_get_bool("DB_PGBOUNCER", False),
+        )
 
     @property
-    def DB_CONNECT_RETRY_DELAY_SECONDS(self) -> int:
-        return self._get_int("DB_CONNECT_RETRY_DELAY_SECONDS", 1)
+    def DATABASE_URL(self) -> str:
+        if not self.database_url:
+            raise ValueError("DATABASE_URL is required")
+        return self.database_url
 
 
-settings = Settings()
+settings = Settings.from_env()
@@ -6,15 +6,18 @@ from sqlalchemy import text
 from sqlalchemy.exc import OperationalError
 
 from app.config import settings
-from app.models.database import _normalize_database_url, engine
+from app.models.database import _database_url, engine
 from app.models import Lot, OneTimeToken, Order, RefreshToken, User  # noqa: F401 - register models
 
 logger = logging.getLogger(__name__)
 
+MAX_RETRY_DELAY_SECONDS = 30
+
 
 def wait_for_db(retries: int, retry_delay_seconds: int) -> None:
-    """Wait for database to accept connections before running migrations."""
+    """Wait for database to accept connections, doubling the delay between attempts up to a cap."""
     last_error = None
+    delay = retry_delay_seconds
     for attempt in range(1, retries + 1):
         try:
             with engine.connect() as conn:
@@ -30,7 +33,8 @@ def wait_for_db(retries: int, retry_delay_seconds: int) -> None:
                 exc,
             )
             if attempt < retries:
-                time.sleep(retry_delay_seconds)
+                time.sleep(delay)
+                delay = min(delay * 2, MAX_RETRY_DELAY_SECONDS)
 
     raise RuntimeError(
         "Database is unreachable after "
@@ -64,7 +68,7 @@ def run_migrations() -> None:
 
     config = Config(str(alembic_ini))
     config.set_main_option("script_location", str(script_location))
-    config.set_main_option("sqlalchemy.url", _normalize_database_url(settings.DATABASE_URL))
+    config.set_main_option("sqlalchemy.url", _database_url)
     command.upgrade(config, "head")
 
 
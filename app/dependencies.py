@@ -1,45 +1,68 @@
 from typing import Annotated
-
-from fastapi import Depends, HTTPException, status
-from fastapi.security import HTTPAuthorizationCredentials, HTTPBearer
-from jose import JWTError, jwt
-from sqlalchemy.orm import Session
-
-from app.config import settings
-from app.models import User, get_db
-
-security = HTTPBearer(auto_error=False)
-
-
-def get_current_user_optional(
-    credentials: Annotated[HTTPAuthorizationCredentials | None, Depends(security)],
-    db: Annotated[Session, Depends(get_db)],
-) -> User | None:
-    if not credentials:
-        return None
-    token = credentials.credentials
+
+from fastapi import Depends, HTTPException, status
+from fastapi.security import HTTPAuthorizationCredentials, HTTPBearer
+from jose import JWTError
+from sqlalchemy.orm import Session
+
+from app.models import User, get_db
+from app.services.access_tokens import decode_access_token
+
+security = HTTPBearer(auto_error=False)
+
+
+def _user_id_from_credentials(credentials: HTTPAuthorizationCredentials | None) -> int | None:
+    if not credentials:
+        return None
+    token = credentials.credentials
     try:
-        payload = jwt.decode(token, settings.JWT_SECRET, algorithms=[settings.JWT_ALGORITHM])
+        payload = decode_access_token(token)
         sub = payload.get("sub")
         token_type = payload.get("type")
         if sub is None:
             return None
         if token_type not in {None, "access"}:
             return None
-        user_id = int(sub) if not isinstance(sub, int) else sub
+        return int(sub) if not isinstance(sub, int) else sub
     except (JWTError, ValueError):
         return None
-    user = db.query(User).filter(User.id == user_id).first()
-    return user
-
-
-def get_current_user(
-    user: Annotated[User | None, Depends(get_current_user_optional)],
-) -> User:
-    if user is None:
-        raise HTTPException(
-            status_code=status.HTTP_401_UNAUTHORIZED,
-            detail="Not authenticated",
-            headers={"WWW-Authenticate": "Bearer"},
-        )
-    return user
+
+
+def _not_authenticated() -> HTTPException:
+    return HTTPException(
+        status_code=status.HTTP_401_UNAUTHORIZED,
+        detail="Not authenticated",
+        headers={"WWW-Authenticate": "Bearer"},
+    )
+
+
+def get_current_user_optional(
+    credentials: Annotated[HTTPAuthorizationCredentials | None, Depends(security)],
+    db: Annotated[Session, Depends(get_db)],
+) -> User | None:
+    user_id = _user_id_from_credentials(credentials)
+    if user_id is None:
+        return None
+    return db.get(User, user_id)
+
+
+def get_current_user(
+    user: Annotated[User | None, Depends(get_current_user_optional)],
+) -> User:
+    if user is None:
+        raise _not_authenticated()
+    return user
+
+
+def get_current_user_id(
+    credentials: Annotated[HTTPAuthorizationCredentials | None, Depends(security)],
+) -> int:
+    """User id from a valid access token, without loading the user row.
+
+    For read-only endpoints that scope queries by user id; anything that needs the
+    account to still exist should depend on get_current_user instead.
+    """
+    user_id = _user_id_from_credentials(credentials)
+    if user_id is None:
+        raise _not_authenticated()
+    return user_id
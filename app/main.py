@@ -1,32 +1,59 @@
 import logging
 import os
 from contextlib import asynccontextmanager
+from functools import lru_cache
 from urllib.parse import urlparse
 
-from fastapi import FastAPI
+import anyio
+from fastapi import FastAPI, Response
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.openapi.utils import get_openapi
+from fastapi.responses import ORJSONResponse
 
 from app.api import auth, lots, order
-from app.config import settings
-from app.db_init import init_db, seed_first_lot
-from app.models import get_db
-from app.webhooks import paykilla_callback, stripe_webhook
-
-# Configure logging
+from app.config import settings
+from app.db_init import init_db, seed_first_lot
+from app.models.database import SessionLocal
+from app.webhooks import paykilla_callback, stripe_webhook
+
+# Configure logging
 logging.basicConfig(
     level=logging.INFO,
     format="%(asctime)s - %(name)s - %(levelname)s - %(message)s",
 )
 logger = logging.getLogger("app.startup")
 
+# Startup validators and diagnostics parse the same few URLs several times.
+_cached_urlparse = lru_cache(maxsize=128)(urlparse)
+
+_HTTP_SCHEMES = frozenset({"http", "https"})
+_LOCALHOSTS = frozenset({"localhost", "127.0.0.1"})
+_POSTGRES_SCHEMES = frozenset({"postgres", "postgresql", "postgresql+psycopg"})
+_RAILWAY_ENV_NAMES = (
+    "RAILWAY_PROJECT_ID",
+    "RAILWAY_SERVICE_ID",
+    "RAILWAY_ENVIRONMENT",
+    "RAILWAY_ENVIRONMENT_NAME",
+    "RAILWAY_PUBLIC_DOMAIN",
+)
+
 
 def _is_localhost(host: str | None) -> bool:
-    return host in {"localhost", "127.0.0.1"}
+    return host in _LOCALHOSTS
+
+
+def _has_hostname(authority: str) -> bool:
+    """Whether urlparse would find a hostname in the text after "//", without building a ParseResult."""
+    end = min((i for i in (authority.find(c) for c in "/?#") if i >= 0), default=len(authority))
+    host = authority[:end].rpartition("@")[2]
+    if host.startswith("["):
+        return host.find("]") > 1
+    return bool(host.partition(":")[0])
 
 
 def _is_http_url(value: str) -> bool:
-    parsed = urlparse(value)
-    return parsed.scheme in {"http", "https"} and bool(parsed.hostname)
+    scheme, sep, rest = value.partition("://")
+    return bool(sep) and scheme.lower() in _HTTP_SCHEMES and _has_hostname(rest)
 
 
 def _strip_wrapping_quotes(value: str) -> str:
@@ -43,13 +70,14 @@ def _normalize_http_url_for_railway(value: str, is_railway: bool) -> tuple[str,
     if _is_http_url(cleaned):
         return cleaned, False
 
-    candidate = urlparse(f"//{cleaned}")
-    if candidate.hostname:
+    if _has_hostname(cleaned):
         return f"https://{cleaned}", True
     return cleaned, False
 
 
-def _get_effective_cors_origins(cors_raw: str, is_railway: bool) -> tuple[list[str], list[str]]:
+@lru_cache(maxsize=8)
+def _get_effective_cors_origins(cors_raw: str, is_railway: bool) -> tuple[tuple[str, ...], tuple[str, ...]]:
+    # Cached: CORSMiddleware setup and the lifespan validation normalize the same origins.
     origins = [origin.strip() for origin in cors_raw.split(",") if origin.strip()]
     normalized_origins: list[str] = []
     coerced_origins: list[str] = []
@@ -60,35 +88,27 @@ def _get_effective_cors_origins(cors_raw: str, is_railway: bool) -> tuple[list[s
         if coerced:
             coerced_origins.append(origin)
 
-    return normalized_origins, coerced_origins
+    return tuple(normalized_origins), tuple(coerced_origins)
 
 
+@lru_cache(maxsize=1)
 def _is_railway_runtime() -> bool:
-    return any(
-        os.getenv(env_name)
-        for env_name in (
-            "RAILWAY_PROJECT_ID",
-            "RAILWAY_SERVICE_ID",
-            "RAILWAY_ENVIRONMENT",
-            "RAILWAY_ENVIRONMENT_NAME",
-            "RAILWAY_PUBLIC_DOMAIN",
-        )
-    )
+    # The platform env does not change during the process lifetime.
+    return any(os.getenv(env_name) for env_name in _RAILWAY_ENV_NAMES)
 
 
 def _validate_database_url_for_runtime(database_url: str) -> None:
-    parsed = urlparse(database_url)
+    parsed = _cached_urlparse(database_url)
     scheme = parsed.scheme
     host = parsed.hostname
     port = parsed.port
     db_name = parsed.path.lstrip("/")
-    postgres_schemes = {"postgres", "postgresql", "postgresql+psycopg"}
 
     if not scheme:
         raise RuntimeError("DATABASE_URL is missing URL scheme (expected postgresql:// or postgresql+psycopg://).")
     if scheme == "sqlite":
         return
-    if scheme not in postgres_schemes:
+    if scheme not in _POSTGRES_SCHEMES:
         raise RuntimeError(
             f"DATABASE_URL has unsupported scheme '{scheme}' "
             "(expected postgresql:// or postgresql+psycopg://)."
@@ -106,7 +126,7 @@ def _validate_database_url_for_runtime(database_url: str) -> None:
 
 
 def _db_url_diagnostics(database_url: str) -> str:
-    parsed = urlparse(database_url)
+    parsed = _cached_urlparse(database_url)
     host = parsed.hostname or "<missing>"
     port = parsed.port or "<missing>"
     db_name = parsed.path.lstrip("/") or "<missing>"
@@ -148,7 +168,7 @@ def _validate_required_env_for_runtime() -> None:
         warnings.append(
             "BASE_URL has no scheme in Railway runtime and was normalized to https:// at startup."
         )
-    parsed_base = urlparse(base_url)
+    parsed_base = _cached_urlparse(base_url)
     if not _is_http_url(base_url):
         errors.append("BASE_URL must be an absolute http(s) URL, e.g. https://your-app.up.railway.app")
     elif is_railway and _is_localhost(parsed_base.hostname):
@@ -172,8 +192,9 @@ def _validate_required_env_for_runtime() -> None:
             )
 
         if is_railway:
+            parsed_origins = [(origin, _cached_urlparse(origin)) for origin in origins]
             localhost_origins = [
-                origin for origin in origins if _is_localhost(urlparse(origin).hostname)
+                origin for origin, parsed in parsed_origins if _is_localhost(parsed.hostname)
             ]
             if localhost_origins:
                 warnings.append(
@@ -188,48 +209,47 @@ def _validate_required_env_for_runtime() -> None:
         raise RuntimeError("Startup environment validation failed: " + " | ".join(errors))
 
 
+def _seed_database() -> None:
+    with SessionLocal() as db:
+        seed_first_lot(db)
+
+
 @asynccontextmanager
 async def lifespan(app: FastAPI):
-    database_url = "<unavailable>"
+    diagnostics = "DATABASE_URL unavailable (missing or unreadable)."
     logger.info("Application startup initiated.")
     try:
         database_url = settings.DATABASE_URL
-        logger.info("DATABASE_URL diagnostics at startup: %s", _db_url_diagnostics(database_url))
+        # Built once: the failure branch logs the same diagnostics again.
+        diagnostics = _db_url_diagnostics(database_url)
+        logger.info("DATABASE_URL diagnostics at startup: %s", diagnostics)
         _validate_database_url_for_runtime(database_url)
         _validate_required_env_for_runtime()
-        init_db()
+        await anyio.to_thread.run_sync(init_db)
     except Exception as exc:
-        diagnostics = (
-            _db_url_diagnostics(database_url)
-            if database_url != "<unavailable>"
-            else "DATABASE_URL unavailable (missing or unreadable)."
-        )
         logger.exception(
             "Database initialization failed: %s. DATABASE_URL diagnostics: %s",
-            str(exc),
+            exc,
             diagnostics,
         )
         raise
-    db = next(get_db())
-    try:
-        seed_first_lot(db)
-    finally:
-        db.close()
+    await anyio.to_thread.run_sync(_seed_database)
     logger.info("Application startup completed successfully.")
     yield
-
-
+
+
 app = FastAPI(
     title="Marketplace API",
     description=(
         "Backend API for fractional marketplace (lots, orders, Stripe/PayKilla). "
         "Use **Authorize** with `accessToken` from `POST /api/auth/login` for protected endpoints."
     ),
-    version="1.0.0",
-    docs_url="/docs",
-    redoc_url="/redoc",
-    openapi_url="/openapi.json",
-    lifespan=lifespan,
+    version="1.0.0",
+    docs_url="/docs",
+    redoc_url="/redoc",
+    openapi_url="/openapi.json",
+    lifespan=lifespan,
+    default_response_class=ORJSONResponse,
     openapi_tags=[
         {"name": "Auth", "description": "Registration, email verification, login, profile, password reset."},
         {"name": "Lots", "description": "List and get lots (fractions, prices)."},
@@ -237,54 +257,59 @@ app = FastAPI(
         {"name": "Webhooks", "description": "Called by Stripe and PayKilla."},
     ],
 )
-
-
-def custom_openapi():
-    if app.openapi_schema:
-        return app.openapi_schema
-    from fastapi.openapi.utils import get_openapi
-
-    openapi_schema = get_openapi(
-        title=app.title,
-        version=app.version,
-        description=app.description,
-        routes=app.routes,
-    )
-    openapi_schema.setdefault("components", {})["securitySchemes"] = {
-        **openapi_schema.get("components", {}).get("securitySchemes", {}),
-        "bearerAuth": {
-            "type": "http",
-            "scheme": "bearer",
-            "bearerFormat": "JWT",
-            "description": "accessToken from POST /api/auth/login",
-        },
-    }
-    app.openapi_schema = openapi_schema
-    return app.openapi_schema
-
-
-app.openapi = custom_openapi
-
+
+
+_BEARER_SCHEME = {
+    "type": "http",
+    "scheme": "bearer",
+    "bearerFormat": "JWT",
+    "description": "accessToken from POST /api/auth/login",
+}
+
+
+def custom_openapi():
+    if app.openapi_schema:
+        return app.openapi_schema
+
+    openapi_schema = get_openapi(
+        title=app.title,
+        version=app.version,
+        description=app.description,
+        routes=app.routes,
+    )
+    openapi_schema.setdefault("components", {}).setdefault("securitySchemes", {})["bearerAuth"] = _BEARER_SCHEME
+    app.openapi_schema = openapi_schema
+    return app.openapi_schema
+
+
+app.openapi = custom_openapi
+
+_cors_origins, _ = _get_effective_cors_origins(settings.CORS_ORIGINS.strip(), _is_railway_runtime())
+
 app.add_middleware(
     CORSMiddleware,
-    allow_origins=_get_effective_cors_origins(settings.CORS_ORIGINS, _is_railway_runtime())[0],
+    allow_origins=list(_cors_origins),
     allow_credentials=True,
     allow_methods=["GET", "POST", "PUT", "DELETE", "OPTIONS"],
     allow_headers=["*"],
 )
-
-app.include_router(auth.router, prefix="/api/auth", tags=["Auth"])
-app.include_router(lots.router, prefix="/api/lots", tags=["Lots"])
-app.include_router(order.router, prefix="/api/orders", tags=["Orders"])
-app.include_router(stripe_webhook.router, prefix="/webhooks", tags=["Webhooks"])
-app.include_router(paykilla_callback.router, prefix="/webhooks", tags=["Webhooks"])
-
-
+
+app.include_router(auth.router, prefix="/api/auth", tags=["Auth"])
+app.include_router(lots.router, prefix="/api/lots", tags=["Lots"])
+app.include_router(order.router, prefix="/api/orders", tags=["Orders"])
+app.include_router(stripe_webhook.router, prefix="/webhooks", tags=["Webhooks"])
+app.include_router(paykilla_callback.router, prefix="/webhooks", tags=["Webhooks"])
+
+
+_ROOT_JSON = b'{"status":"ok","service":"Marketplace API"}'
+_HEALTH_JSON = b'{"status":"ok"}'
+
+
 @app.get("/")
-def root():
-    return {"status": "ok", "service": "Marketplace API"}
+async def root():
+    return Response(content=_ROOT_JSON, media_type="application/json")
 
 
 @app.get("/health")
-def health():
-    return {"status": "ok"}
+async def health():
+    return Response(content=_HEALTH_JSON, media_type="application/json")
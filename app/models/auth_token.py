@@ -1,4 +1,4 @@
-from sqlalchemy import Column, DateTime, ForeignKey, Integer, String
+from sqlalchemy import Column, DateTime, ForeignKey, Integer, LargeBinary, String
 from sqlalchemy.sql import func
 
 from app.models.database import Base
@@ -7,10 +7,10 @@ from app.models.database import Base
 class OneTimeToken(Base):
     __tablename__ = "one_time_tokens"
 
-    id = Column(Integer, primary_key=True, index=True)
+    id = Column(Integer, primary_key=True)
     user_id = Column(Integer, ForeignKey("users.id"), nullable=False, index=True)
     purpose = Column(String(32), nullable=False, index=True)  # email_verify | password_reset
-    token_hash = Column(String(128), unique=True, nullable=False, index=True)
+    token_hash = Column(LargeBinary(32), unique=True, nullable=False, index=True)
     expires_at = Column(DateTime(timezone=True), nullable=False)
     used_at = Column(DateTime(timezone=True), nullable=True)
     created_at = Column(DateTime(timezone=True), server_default=func.now())
@@ -19,9 +19,9 @@ class OneTimeToken(Base):
 class RefreshToken(Base):
     __tablename__ = "refresh_tokens"
 
-    id = Column(Integer, primary_key=True, index=True)
+    id = Column(Integer, primary_key=True)
     user_id = Column(Integer, ForeignKey("users.id"), nullable=False, index=True)
-    token_hash = Column(String(128), unique=True, nullable=False, index=True)
+    token_hash = Column(LargeBinary(32), unique=True, nullable=False, index=True)
     expires_at = Column(DateTime(timezone=True), nullable=False)
     revoked_at = Column(DateTime(timezone=True), nullable=True)
     replaced_by_id = Column(Integer, ForeignKey("refresh_tokens.id"), nullable=True)
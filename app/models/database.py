@@ -14,7 +14,30 @@ def _normalize_database_url(database_url: str) -> str:
     return database_url
 
 
-engine = create_engine(_normalize_database_url(settings.DATABASE_URL))
+def _engine_options(database_url: str) -> dict:
+    if database_url.startswith("sqlite"):
+        return {}
+
+    options = {
+        "pool_size": settings.DB_POOL_SIZE,
+        "max_overflow": settings.DB_MAX_OVERFLOW,
+        "pool_timeout": settings.DB_POOL_TIMEOUT_SECONDS,
+        "pool_recycle": settings.DB_POOL_RECYCLE_SECONDS,
+        "pool_pre_ping": True,
+    }
+    if database_url.startswith("postgresql"):
+        # Short OLTP queries never benefit from JIT compilation, but can pay its startup cost.
+        connect_args = {"options": "-c jit=off"}
+        if settings.DB_PGBOUNCER:
+            # Transaction pooling hands each transaction a different server connection,
+            # so psycopg's server-side prepared statements cannot be reused.
+            connect_args["prepare_threshold"] = None
+        options["connect_args"] = connect_args
+    return options
+
+
+_database_url = _normalize_database_url(settings.DATABASE_URL)
+engine = create_engine(_database_url, **_engine_options(_database_url))
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 Base = declarative_base()
 
@@ -1,19 +1,57 @@
-from sqlalchemy import Column, Integer, String, Numeric, Boolean, DateTime
-from sqlalchemy.sql import func
-
-from app.models.database import Base
-
-
-class Lot(Base):
-    __tablename__ = "lots"
-
-    id = Column(Integer, primary_key=True, index=True)
-    name = Column(String(255), nullable=False)
-    slug = Column(String(255), unique=True, index=True, nullable=False)
-    total_fractions = Column(Integer, nullable=False)
-    special_price_fractions_cap = Column(Integer, nullable=False)
-    price_special_eur = Column(Numeric(10, 4), nullable=False)
-    price_nominal_eur = Column(Numeric(10, 4), nullable=False)
-    sold_special_fractions = Column(Integer, default=0, nullable=False)
-    is_active = Column(Boolean, default=True, nullable=False)
-    created_at = Column(DateTime(timezone=True), server_default=func.now())
+from decimal import Decimal
+
+from sqlalchemy import BigInteger, Boolean, Column, DateTime, Integer, String
+from sqlalchemy.sql import func
+
+from app.models.database import Base
+
+MICRO_EUR_PER_EUR = 1_000_000
+MICRO_EUR_PER_CENT = 10_000
+
+
+def micro_eur_to_decimal(value: int) -> Decimal:
+    return Decimal(value).scaleb(-6)
+
+
+def format_micro_eur(value: int) -> str:
+    """Render micro-EUR as a plain decimal string without trailing zeros, e.g. 30000 -> "0.03"."""
+    whole, fraction = divmod(value, MICRO_EUR_PER_EUR)
+    if not fraction:
+        return str(whole)
+    return f"{whole}.{fraction:06d}".rstrip("0")
+
+
+def decimal_to_micro_eur(value: Decimal | float | str) -> int:
+    return int((Decimal(str(value)) * MICRO_EUR_PER_EUR).to_integral_value())
+
+
+class Lot(Base):
+    __tablename__ = "lots"
+
+    id = Column(Integer, primary_key=True)
+    name = Column(String(255), nullable=False)
+    slug = Column(String(255), unique=True, index=True, nullable=False)
+    total_fractions = Column(Integer, nullable=False)
+    special_price_fractions_cap = Column(Integer, nullable=False)
+    # Prices are stored as integer micro-EUR (1 EUR = 1_000_000).
+    price_special_micro_eur = Column(BigInteger, nullable=False)
+    price_nominal_micro_eur = Column(BigInteger, nullable=False)
+    sold_special_fractions = Column(Integer, default=0, nullable=False)
+    is_active = Column(Boolean, default=True, nullable=False)
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+
+    @property
+    def price_special_eur(self) -> Decimal:
+        return micro_eur_to_decimal(self.price_special_micro_eur)
+
+    @price_special_eur.setter
+    def price_special_eur(self, value: Decimal | float | str) -> None:
+        self.price_special_micro_eur = decimal_to_micro_eur(value)
+
+    @property
+    def price_nominal_eur(self) -> Decimal:
+        return micro_eur_to_decimal(self.price_nominal_micro_eur)
+
+    @price_nominal_eur.setter
+    def price_nominal_eur(self, value: Decimal | float | str) -> None:
+        self.price_nominal_micro_eur = decimal_to_micro_eur(value)
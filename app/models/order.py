@@ -7,7 +7,7 @@ from app.models.database import Base
 class Order(Base):
     __tablename__ = "orders"
 
-    id = Column(Integer, primary_key=True, index=True)
+    id = Column(Integer, primary_key=True)
     user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
     lot_id = Column(Integer, ForeignKey("lots.id"), nullable=False)
     fraction_count = Column(Integer, nullable=False)
@@ -1,39 +1,29 @@
 from decimal import Decimal
-from pydantic import BaseModel, field_serializer
+from typing import Annotated
 
+from pydantic import BaseModel, PlainSerializer
 
-class _LotBaseResponse(BaseModel):
-    @field_serializer("price_special_eur", "price_nominal_eur", check_fields=False)
-    def serialize_price(self, value: Decimal) -> str:
-        normalized = value.normalize()
-        return format(normalized, "f")
+# Prices are rendered as plain decimal strings, e.g. "0.03".
+PriceDecimal = Annotated[
+    Decimal,
+    PlainSerializer(lambda value: format(value.normalize(), "f"), return_type=str, when_used="always"),
+]
 
 
-class LotListResponse(_LotBaseResponse):
+class LotListResponse(BaseModel):
     id: int
     name: str
     slug: str
     total_fractions: int
     special_price_fractions_cap: int
     remaining_special_fractions: int
-    price_special_eur: Decimal
-    price_nominal_eur: Decimal
+    price_special_eur: PriceDecimal
+    price_nominal_eur: PriceDecimal
     min_fractions_to_buy: int
     is_active: bool
 
-    model_config = {"from_attributes": True}
+    model_config = {"from_attributes": True, "frozen": True}
 
 
-class LotDetailResponse(_LotBaseResponse):
-    id: int
-    name: str
-    slug: str
-    total_fractions: int
-    special_price_fractions_cap: int
-    remaining_special_fractions: int
-    price_special_eur: Decimal
-    price_nominal_eur: Decimal
-    min_fractions_to_buy: int
-    is_active: bool
-
-    model_config = {"from_attributes": True}
+class LotDetailResponse(LotListResponse):
+    pass
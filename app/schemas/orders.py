@@ -1,4 +1,6 @@
+from datetime import datetime
 from enum import Enum
+from typing import Literal
 
 from pydantic import BaseModel
 
@@ -8,10 +10,14 @@ class PaymentMethod(str, Enum):
     PAYKILLA = "paykilla"
 
 
+# Field type for payment methods: validates as a plain str, no Enum member lookup.
+PaymentMethodName = Literal["stripe", "paykilla"]
+
+
 class OrderCreateRequest(BaseModel):
     lot_id: int
     fraction_count: int
-    payment_method: PaymentMethod
+    payment_method: PaymentMethodName
     return_url: str | None = None
     cancel_url: str | None = None
 
@@ -34,21 +40,27 @@ class OrderCreateResponse(BaseModel):
     order_id: int
     checkout_url: str | None = None
     session_id: str | None = None
-    payment_method: PaymentMethod
+    payment_method: PaymentMethodName
 
 
 class OrderResponse(BaseModel):
     id: int
     lot_id: int
+    lot_name: str | None = None
     fraction_count: int
     amount_eur_cents: int
-    payment_method: PaymentMethod
+    payment_method: PaymentMethodName
     status: str
-    created_at: str
+    created_at: datetime | None
 
     model_config = {"from_attributes": True}
 
 
+class OrderListResponse(BaseModel):
+    data: list[OrderResponse]
+    next_cursor: str | None = None
+
+
 class OrderStatusResponse(BaseModel):
     id: int
     status: str
@@ -57,5 +69,5 @@ class OrderStatusResponse(BaseModel):
 
 
 class PaymentMethodsResponse(BaseModel):
-    available_methods: list[PaymentMethod]
-    enabled_methods: list[PaymentMethod]
+    available_methods: list[PaymentMethodName]
+    enabled_methods: list[PaymentMethodName]
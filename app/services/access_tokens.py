@@ -0,0 +1,84 @@
+import base64
+import binascii
+import hashlib
+import hmac
+from datetime import datetime, timedelta, timezone
+from functools import lru_cache
+
+import orjson
+from jose import jwt
+from jose.exceptions import ExpiredSignatureError, JWTError
+
+from app.config import settings
+
+_HS256_HEADER_B64 = base64.urlsafe_b64encode(b'{"alg":"HS256","typ":"JWT"}').rstrip(b"=")
+# Claims create_access_token emits; tokens carrying anything else are validated by jose.
+_HS256_FAST_PATH_CLAIMS = frozenset({"sub", "exp", "type"})
+
+
+@lru_cache(maxsize=4)
+def _hs256_signer(secret: str) -> hmac.HMAC:
+    return hmac.new(secret.encode("utf-8"), digestmod=hashlib.sha256)
+
+
+def _hs256_signature(signing_input: bytes) -> bytes:
+    signer = _hs256_signer(settings.JWT_SECRET).copy()
+    signer.update(signing_input)
+    return _b64url(signer.digest())
+
+
+def _b64url(data: bytes) -> bytes:
+    return base64.urlsafe_b64encode(data).rstrip(b"=")
+
+
+def _b64url_decode(data: bytes) -> bytes:
+    return base64.urlsafe_b64decode(data + b"=" * (-len(data) % 4))
+
+
+def create_access_token(user_id: int) -> str:
+    expire = datetime.now(timezone.utc) + timedelta(minutes=settings.JWT_EXPIRE_MINUTES)
+    to_encode = {"sub": str(user_id), "exp": int(expire.timestamp()), "type": "access"}
+    if settings.JWT_ALGORITHM != "HS256":
+        return jwt.encode(to_encode, settings.JWT_SECRET, algorithm=settings.JWT_ALGORITHM)
+
+    # HS256 fast path: fixed header and a keyed HMAC copied per token instead of a full jose encode.
+    signing_input = _HS256_HEADER_B64 + b"." + _b64url(orjson.dumps(to_encode))
+    return (signing_input + b"." + _hs256_signature(signing_input)).decode("ascii")
+
+
+def _decode_hs256(token: str) -> dict | None:
+    """Verify a token shaped like create_access_token output; None defers to jose for anything else."""
+    try:
+        header, payload, signature = token.encode("ascii").split(b".")
+    except (UnicodeEncodeError, ValueError):
+        return None
+    if header != _HS256_HEADER_B64:
+        return None
+
+    if not hmac.compare_digest(signature, _hs256_signature(header + b"." + payload)):
+        raise JWTError("Signature verification failed.")
+    try:
+        claims = orjson.loads(_b64url_decode(payload))
+    except (binascii.Error, orjson.JSONDecodeError):
+        raise JWTError("Invalid payload string")
+    if not isinstance(claims, dict) or not claims.keys() <= _HS256_FAST_PATH_CLAIMS:
+        return None
+
+    exp = claims.get("exp")
+    if exp is not None:
+        if not isinstance(exp, int) or isinstance(exp, bool):
+            return None
+        if exp < int(datetime.now(timezone.utc).timestamp()):
+            raise ExpiredSignatureError("Signature has expired.")
+    if not isinstance(claims.get("sub", ""), str):
+        return None
+    return claims
+
+
+def decode_access_token(token: str) -> dict:
+    """Return verified access token claims; raises JWTError like jose.jwt.decode."""
+    if settings.JWT_ALGORITHM == "HS256":
+        claims = _decode_hs256(token)
+        if claims is not None:
+            return claims
+    return jwt.decode(token, settings.JWT_SECRET, algorithms=[settings.JWT_ALGORITHM])
@@ -2,6 +2,7 @@ import hashlib
 import secrets
 from datetime import datetime, timedelta, timezone
 
+from sqlalchemy import DateTime, LargeBinary, String, insert, literal, select, update
 from sqlalchemy.orm import Session
 
 from app.models import OneTimeToken, RefreshToken
@@ -20,8 +21,8 @@ def _as_utc(value: datetime) -> datetime:
     return value.astimezone(timezone.utc)
 
 
-def _hash_token(token: str) -> str:
-    return hashlib.sha256(token.encode("utf-8")).hexdigest()
+def _hash_token(token: str) -> bytes:
+    return hashlib.sha256(token.encode("utf-8")).digest()
 
 
 def _db_datetime(db: Session, value: datetime) -> datetime:
@@ -67,25 +68,24 @@ def consume_one_time_token(db: Session, raw_token: str, purpose: str) -> OneTime
     now = utcnow()
     db_now = _db_datetime(db, now)
 
-    updated = (
-        db.query(OneTimeToken)
-        .filter(
+    stmt = (
+        update(OneTimeToken)
+        .where(
             OneTimeToken.token_hash == token_hash,
             OneTimeToken.purpose == purpose,
             OneTimeToken.used_at.is_(None),
             OneTimeToken.expires_at > db_now,
         )
-        .update(
-            {
-                OneTimeToken.used_at: db_now,
-            },
-            synchronize_session=False,
-        )
+        .values(used_at=db_now)
+        .execution_options(synchronize_session=False)
     )
-    if updated != 1:
-        return None
+    if db.get_bind().dialect.update_returning:
+        # Mark as used and load the row in one round trip.
+        return db.scalars(stmt.returning(OneTimeToken)).one_or_none()
 
-    record = (
+    if db.execute(stmt).rowcount != 1:
+        return None
+    return (
         db.query(OneTimeToken)
         .filter(
             OneTimeToken.token_hash == token_hash,
@@ -93,9 +93,6 @@ def consume_one_time_token(db: Session, raw_token: str, purpose: str) -> OneTime
         )
         .first()
     )
-    if not record:
-        return None
-    return record
 
 
 def issue_refresh_token(
@@ -154,17 +151,60 @@ def revoke_refresh_token_by_raw(db: Session, raw_token: str) -> bool:
 def revoke_all_refresh_tokens_for_user(db: Session, user_id: int) -> None:
     now = utcnow()
     db_now = _db_datetime(db, now)
-    tokens = (
-        db.query(RefreshToken)
-        .filter(
-            RefreshToken.user_id == user_id,
+    db.query(RefreshToken).filter(
+        RefreshToken.user_id == user_id,
+        RefreshToken.revoked_at.is_(None),
+    ).update(
+        {
+            RefreshToken.revoked_at: db_now,
+        },
+        synchronize_session=False,
+    )
+
+
+def _rotate_refresh_token_cte(
+    db: Session,
+    token_hash: bytes,
+    new_token_hash: bytes,
+    now: datetime,
+    expires_at: datetime,
+    ip: str | None,
+    user_agent: str | None,
+) -> int | None:
+    """Lock, replace and revoke a refresh token in one PostgreSQL statement; returns the user id."""
+    current = (
+        select(RefreshToken.id, RefreshToken.user_id)
+        .where(
+            RefreshToken.token_hash == token_hash,
             RefreshToken.revoked_at.is_(None),
+            RefreshToken.expires_at > now,
         )
-        .all()
+        .with_for_update()
+        .cte("current_token")
     )
-    for token in tokens:
-        token.revoked_at = db_now
-    db.flush()
+    replacement = (
+        insert(RefreshToken)
+        .from_select(
+            ["user_id", "token_hash", "expires_at", "ip", "user_agent"],
+            select(
+                current.c.user_id,
+                literal(new_token_hash, LargeBinary),
+                literal(expires_at, DateTime(timezone=True)),
+                literal(ip, String),
+                literal(user_agent, String),
+            ),
+        )
+        .returning(RefreshToken.id, RefreshToken.user_id)
+        .cte("replacement_token")
+    )
+    stmt = (
+        update(RefreshToken)
+        .where(RefreshToken.id == current.c.id)
+        .values(revoked_at=now, replaced_by_id=replacement.c.id)
+        .returning(replacement.c.user_id)
+        .execution_options(synchronize_session=False)
+    )
+    return db.scalar(stmt)
 
 
 def rotate_refresh_token(
@@ -178,12 +218,36 @@ def rotate_refresh_token(
     now = utcnow()
     db_now = _db_datetime(db, now)
 
+    if db.get_bind().dialect.name == "postgresql":
+        new_raw = _new_token()
+        user_id = _rotate_refresh_token_cte(
+            db,
+            token_hash=token_hash,
+            new_token_hash=_hash_token(new_raw),
+            now=now,
+            expires_at=now + timedelta(days=expires_in_days),
+            ip=ip,
+            user_agent=user_agent,
+        )
+        if user_id is None:
+            return None
+        return user_id, new_raw
+
     current = db.query(RefreshToken).filter(RefreshToken.token_hash == token_hash).first()
     if not current:
         return None
     if current.revoked_at is not None or _as_utc(current.expires_at) <= now:
         return None
 
+    new_raw, new_record = issue_refresh_token(
+        db=db,
+        user_id=current.user_id,
+        expires_in_days=expires_in_days,
+        ip=ip,
+        user_agent=user_agent,
+    )
+
+    # Revoke and link the replacement in one conditional UPDATE; it also guards concurrent rotations.
     updated = (
         db.query(RefreshToken)
         .filter(
@@ -194,20 +258,14 @@ def rotate_refresh_token(
         .update(
             {
                 RefreshToken.revoked_at: db_now,
+                RefreshToken.replaced_by_id: new_record.id,
             },
             synchronize_session=False,
         )
     )
     if updated != 1:
+        db.delete(new_record)
+        db.flush()
         return None
 
-    new_raw, new_record = issue_refresh_token(
-        db=db,
-        user_id=current.user_id,
-        expires_in_days=expires_in_days,
-        ip=ip,
-        user_agent=user_agent,
-    )
-    current.replaced_by_id = new_record.id
-    db.flush()
     return current.user_id, new_raw
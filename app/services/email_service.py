@@ -1,9 +1,13 @@
+import queue
 import smtplib
 from email.message import EmailMessage
 from urllib.parse import parse_qsl, urlencode, urlparse, urlunparse
 
 from app.config import settings
 
+# Idle authenticated SMTP connections; saves the connect/STARTTLS/AUTH handshake per email.
+_smtp_pool: queue.LifoQueue[smtplib.SMTP] = queue.LifoQueue()
+
 
 def _build_frontend_link(path: str, token: str) -> str:
     base = f"{settings.FRONTEND_URL.rstrip('/')}/{path.lstrip('/')}"
@@ -13,6 +17,50 @@ def _build_frontend_link(path: str, token: str) -> str:
     return urlunparse(parsed._replace(query=urlencode(query)))
 
 
+def _connect_smtp() -> smtplib.SMTP:
+    smtp = smtplib.SMTP(settings.SMTP_HOST, settings.SMTP_PORT)
+    try:
+        smtp.ehlo()
+        if settings.SMTP_USE_TLS:
+            smtp.starttls()
+            smtp.ehlo()
+        if settings.SMTP_USER:
+            smtp.login(settings.SMTP_USER, settings.SMTP_PASSWORD)
+    except Exception:
+        _close_smtp(smtp)
+        raise
+    return smtp
+
+
+def _close_smtp(smtp: smtplib.SMTP) -> None:
+    try:
+        smtp.quit()
+    except (smtplib.SMTPException, OSError):
+        smtp.close()
+
+
+def _checkout_smtp() -> smtplib.SMTP:
+    """Reuse an idle authenticated connection when the server still answers NOOP."""
+    while True:
+        try:
+            smtp = _smtp_pool.get_nowait()
+        except queue.Empty:
+            return _connect_smtp()
+        try:
+            if smtp.noop()[0] == 250:
+                return smtp
+        except (smtplib.SMTPException, OSError):
+            pass
+        smtp.close()
+
+
+def _release_smtp(smtp: smtplib.SMTP) -> None:
+    if _smtp_pool.qsize() < settings.SMTP_POOL_SIZE:
+        _smtp_pool.put_nowait(smtp)
+    else:
+        _close_smtp(smtp)
+
+
 def _send_email(to_email: str, subject: str, text_body: str, html_body: str | None = None) -> None:
     if not settings.SMTP_HOST or not settings.SMTP_FROM_EMAIL:
         raise RuntimeError("SMTP is not configured (SMTP_HOST and SMTP_FROM_EMAIL are required).")
@@ -25,14 +73,13 @@ def _send_email(to_email: str, subject: str, text_body: str, html_body: str | No
     if html_body:
         message.add_alternative(html_body, subtype="html")
 
-    with smtplib.SMTP(settings.SMTP_HOST, settings.SMTP_PORT) as smtp:
-        smtp.ehlo()
-        if settings.SMTP_USE_TLS:
-            smtp.starttls()
-            smtp.ehlo()
-        if settings.SMTP_USER:
-            smtp.login(settings.SMTP_USER, settings.SMTP_PASSWORD)
+    smtp = _checkout_smtp()
+    try:
         smtp.send_message(message)
+    except Exception:
+        _close_smtp(smtp)
+        raise
+    _release_smtp(smtp)
 
 
 def send_verify_email(to_email: str, display_name: str | None, token: str) -> None:
@@ -1,5 +1,6 @@
 # PayKilla integration - placeholder; real implementation in paykilla todo
 
+from app.config import settings
 from app.services.url_utils import append_query_param
 
 
@@ -10,8 +11,6 @@ def create_payment(
     cancel_url: str,
 ) -> str:
     """Create PayKilla payment and return checkout URL. Placeholder returns success_url with order_id."""
-    from app.config import settings
-
     if not settings.PAYKILLA_API_KEY:
         raise ValueError("PAYKILLA_API_KEY is not set")
     # TODO: call PayKilla API per their docs
@@ -1,17 +1,18 @@
 from dataclasses import dataclass
+from functools import lru_cache
 from typing import Callable
 
 from app.config import settings
-from app.services import paykilla_service, stripe_service
+from app.services import paykilla_service
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class CheckoutResult:
     checkout_url: str
     session_id: str | None = None
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class PaymentGateway:
     method: str
     create_checkout: Callable[[int, int, int, str, str, str], CheckoutResult]
@@ -28,6 +29,9 @@ def _create_stripe_checkout(
     success_url: str,
     cancel_url: str,
 ) -> CheckoutResult:
+    # The stripe SDK takes a large share of app import time; load it on the first Stripe checkout.
+    from app.services import stripe_service
+
     checkout_url, session_id = stripe_service.create_checkout_session(
         order_id=order_id,
         amount_eur_cents=amount_eur_cents,
@@ -56,6 +60,8 @@ def _create_paykilla_checkout(
     return CheckoutResult(checkout_url=checkout_url)
 
 
+# Settings are read once per process, so the gateway set never changes; tests call cache_clear().
+@lru_cache(maxsize=1)
 def get_payment_gateways() -> dict[str, PaymentGateway]:
     return {
         "stripe": PaymentGateway(
@@ -75,5 +81,6 @@ def get_payment_gateways() -> dict[str, PaymentGateway]:
     }
 
 
-def get_enabled_payment_methods() -> list[str]:
-    return [method for method, gateway in get_payment_gateways().items() if gateway.enabled]
+@lru_cache(maxsize=1)
+def get_enabled_payment_methods() -> tuple[str, ...]:
+    return tuple(method for method, gateway in get_payment_gateways().items() if gateway.enabled)
@@ -1,5 +1,6 @@
 import stripe
 
+from app.config import settings
 from app.services.url_utils import append_query_param
 
 
@@ -12,8 +13,6 @@ def create_checkout_session(
     cancel_url: str,
 ) -> tuple[str, str]:
     """Create Stripe Checkout Session and return (checkout URL, session ID)."""
-    from app.config import settings
-
     if not settings.STRIPE_SECRET_KEY:
         raise ValueError("STRIPE_SECRET_KEY is not set")
     stripe.api_key = settings.STRIPE_SECRET_KEY
@@ -1,4 +1,4 @@
-from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+from urllib.parse import parse_qsl, quote_plus, urlencode, urlsplit, urlunsplit
 
 from fastapi import HTTPException, status
 
@@ -8,6 +8,12 @@ ALLOWED_REDIRECT_SCHEMES = {"http", "https"}
 
 def append_query_param(url: str, key: str, value: str | int) -> str:
     """Append a query parameter to URL while preserving existing query params and fragments."""
+    if "?" not in url:
+        # No existing query to re-encode: splice the pair in ahead of any fragment.
+        base, _, fragment = url.partition("#")
+        query = f"{quote_plus(key)}={quote_plus(str(value))}"
+        return f"{base}?{query}#{fragment}" if fragment else f"{base}?{query}"
+
     parts = urlsplit(url)
     query_params = parse_qsl(parts.query, keep_blank_values=True)
     query_params.append((key, str(value)))
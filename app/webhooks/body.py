@@ -0,0 +1,36 @@
+from typing import Callable, TypeVar
+
+import anyio.to_thread
+from fastapi import HTTPException, Request, status
+
+T = TypeVar("T")
+
+# Generous for Stripe events and PayKilla callbacks, but bounds buffering and HMAC work per request.
+WEBHOOK_MAX_BODY_BYTES = 256 * 1024
+# Hashing/parsing bodies above this size moves to a worker thread so concurrent webhooks interleave.
+INLINE_VERIFY_MAX_BYTES = 16 * 1024
+
+
+def _payload_too_large() -> HTTPException:
+    return HTTPException(status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE, detail="Payload too large")
+
+
+async def read_capped_body(request: Request, max_bytes: int = WEBHOOK_MAX_BODY_BYTES) -> bytes:
+    """Read the raw request body into one buffer, rejecting it with 413 once it exceeds max_bytes."""
+    content_length = request.headers.get("content-length")
+    if content_length and content_length.isdigit() and int(content_length) > max_bytes:
+        raise _payload_too_large()
+
+    body = bytearray()
+    async for chunk in request.stream():
+        body += chunk
+        if len(body) > max_bytes:
+            raise _payload_too_large()
+    return bytes(body)
+
+
+async def verify_body(verify: Callable[..., T], body: bytes, *args) -> T:
+    """Run verify(body, *args) inline for small bodies and in the threadpool for large ones."""
+    if len(body) > INLINE_VERIFY_MAX_BYTES:
+        return await anyio.to_thread.run_sync(verify, body, *args)
+    return verify(body, *args)
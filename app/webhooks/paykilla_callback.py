@@ -1,28 +1,50 @@
 import hashlib
 import hmac
-import json
 import logging
+from functools import lru_cache
 
+import orjson
 from fastapi import APIRouter, Depends, HTTPException, Request, status
+from sqlalchemy import bindparam, select
 from sqlalchemy.orm import Session
 
 from app.config import settings
-from app.models import Lot, Order, get_db
+from app.models import Order, get_db
+from app.webhooks.body import read_capped_body, verify_body
+from app.webhooks.settlement import settle_paid_order
 
 router = APIRouter()
 logger = logging.getLogger(__name__)
 
 
-SUCCESSFUL_PAYKILLA_STATUSES = {"success", "paid", "completed", "confirmed"}
+# Row lock on just the columns the payment checks read; no ORM instance is hydrated.
+_PAYABLE_ORDER_STMT = (
+    select(
+        Order.lot_id,
+        Order.fraction_count,
+        Order.amount_eur_cents,
+        Order.payment_method,
+        Order.status,
+    )
+    .where(Order.id == bindparam("order_id"))
+    .with_for_update()
+)
+
+SUCCESSFUL_PAYKILLA_STATUSES = frozenset({"success", "paid", "completed", "confirmed"})
 
 
 def is_successful_payment_status(status_value: str | None) -> bool:
     """Return True when PayKilla callback status means payment is successful."""
-    if status_value is None:
+    if status_value is None or status_value in SUCCESSFUL_PAYKILLA_STATUSES:
         return True
     return status_value.strip().lower() in SUCCESSFUL_PAYKILLA_STATUSES
 
 
+@lru_cache(maxsize=4)
+def _paykilla_signer(secret: str) -> hmac.HMAC:
+    return hmac.new(secret.encode("utf-8"), digestmod=hashlib.sha256)
+
+
 def _verify_paykilla_signature(raw_body: bytes, signature: str | None) -> None:
     """Validate HMAC SHA-256 signature when PAYKILLA_WEBHOOK_SECRET is configured."""
     if not settings.PAYKILLA_WEBHOOK_SECRET:
@@ -32,11 +54,10 @@ def _verify_paykilla_signature(raw_body: bytes, signature: str | None) -> None:
     if not signature:
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Missing webhook signature")
 
-    expected = hmac.new(
-        settings.PAYKILLA_WEBHOOK_SECRET.encode("utf-8"),
-        raw_body,
-        hashlib.sha256,
-    ).hexdigest()
+    # Copying the keyed HMAC skips re-deriving the key pads on every callback.
+    signer = _paykilla_signer(settings.PAYKILLA_WEBHOOK_SECRET).copy()
+    signer.update(raw_body)
+    expected = signer.hexdigest()
 
     if not hmac.compare_digest(signature, expected):
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid webhook signature")
@@ -50,17 +71,17 @@ def mark_order_paid_and_increment_lot(
 ) -> bool:
     """Mark order as paid and increment lot sold fractions. Returns True if successful."""
     try:
-        order = db.query(Order).filter(Order.id == order_id).with_for_update().first()
+        order = db.execute(_PAYABLE_ORDER_STMT, {"order_id": order_id}).first()
         if not order:
-            logger.warning(f"Order {order_id} not found")
+            logger.warning("Order %s not found", order_id)
             return False
 
         if order.payment_method != "paykilla":
-            logger.warning(f"Order {order_id} payment method is {order.payment_method}, not paykilla")
+            logger.warning("Order %s payment method is %s, not paykilla", order_id, order.payment_method)
             return False
 
         if order.status == "paid":
-            logger.info(f"Order {order_id} already paid, skipping")
+            logger.info("Order %s already paid, skipping", order_id)
             return True
 
         if callback_amount_cents is not None and callback_amount_cents != order.amount_eur_cents:
@@ -72,31 +93,22 @@ def mark_order_paid_and_increment_lot(
             )
             return False
 
-        lot = db.query(Lot).filter(Lot.id == order.lot_id).with_for_update().first()
-        if not lot:
-            logger.error(f"Lot {order.lot_id} not found for order {order_id}")
-            db.rollback()
-            return False
-
-
-        remaining = max(0, lot.special_price_fractions_cap - (lot.sold_special_fractions or 0))
-        if order.fraction_count > remaining:
+        lot_id = order.lot_id
+        if not settle_paid_order(db, order_id, lot_id, order.fraction_count, external_id):
             logger.warning(
-                "Cannot mark order %s as paid: %s fractions requested, %s remaining",
+                "Cannot mark order %s as paid: lot %s not found or fewer than %s fractions remaining",
                 order_id,
+                lot_id,
                 order.fraction_count,
-                remaining,
             )
             db.rollback()
             return False
-        lot.sold_special_fractions = (lot.sold_special_fractions or 0) + order.fraction_count
-        order.status = "paid"
-        order.external_payment_id = external_id
+
         db.commit()
-        logger.info(f"Order {order_id} marked as paid, lot {lot.id} updated")
+        logger.info("Order %s marked as paid, lot %s updated", order_id, lot_id)
         return True
     except Exception as e:
-        logger.error(f"Error processing order {order_id}: {e}", exc_info=True)
+        logger.error("Error processing order %s: %s", order_id, e, exc_info=True)
         db.rollback()
         return False
 
@@ -114,14 +126,14 @@ async def paykilla_webhook(
     Expects JSON body with order_id (and optionally status, transaction_id).
     Idempotent: if order already paid, no double spend.
     """
-    raw_body = await request.body()
+    raw_body = await read_capped_body(request)
     signature = request.headers.get("x-paykilla-signature")
-    _verify_paykilla_signature(raw_body, signature)
+    await verify_body(_verify_paykilla_signature, raw_body, signature)
 
     try:
-        body = json.loads(raw_body)
-    except Exception as e:
-        logger.error(f"Invalid JSON in PayKilla webhook: {e}")
+        body = orjson.loads(raw_body)
+    except orjson.JSONDecodeError as e:
+        logger.error("Invalid JSON in PayKilla webhook: %s", e)
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid JSON")
 
     order_id = body.get("order_id")
@@ -131,7 +143,7 @@ async def paykilla_webhook(
     try:
         order_id = int(order_id)
     except (TypeError, ValueError) as e:
-        logger.error(f"Invalid order_id format: {order_id}, error: {e}")
+        logger.error("Invalid order_id format: %s, error: %s", order_id, e)
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="order_id must be integer")
 
     if order_id <= 0:
@@ -139,7 +151,7 @@ async def paykilla_webhook(
 
     payment_status = body.get("status")
     if not is_successful_payment_status(payment_status):
-        logger.info(f"Ignoring PayKilla webhook for order {order_id} with status: {payment_status}")
+        logger.info("Ignoring PayKilla webhook for order %s with status: %s", order_id, payment_status)
         return {"received": True}
 
     external_id = body.get("transaction_id") or body.get("payment_id")
@@ -155,6 +167,6 @@ async def paykilla_webhook(
 
     success = mark_order_paid_and_increment_lot(order_id, external_id, callback_amount_cents, db)
     if not success:
-        logger.warning(f"Failed to process PayKilla webhook for order {order_id}")
+        logger.warning("Failed to process PayKilla webhook for order %s", order_id)
 
     return {"received": True}
@@ -0,0 +1,53 @@
+from sqlalchemy import bindparam, select, update
+from sqlalchemy.orm import Session
+
+from app.models import Lot, Order
+
+# Increments sold fractions only while the lot's special cap still has room for the order.
+_RESERVE_LOT_FRACTIONS_STMT = (
+    update(Lot)
+    .where(
+        Lot.id == bindparam("paid_lot_id"),
+        Lot.special_price_fractions_cap - Lot.sold_special_fractions >= bindparam("paid_fractions"),
+    )
+    .values(sold_special_fractions=Lot.sold_special_fractions + bindparam("paid_fractions"))
+    .execution_options(synchronize_session=False)
+)
+
+_MARK_ORDER_PAID_STMT = (
+    update(Order)
+    .where(Order.id == bindparam("order_id"))
+    .values(status="paid", external_payment_id=bindparam("payment_ref"))
+    .execution_options(synchronize_session=False)
+)
+
+# Postgres: both writes in one statement; the order only flips to paid if the lot UPDATE matched a row.
+_reserved_lot = _RESERVE_LOT_FRACTIONS_STMT.returning(Lot.id).cte("reserved_lot")
+_SETTLE_ORDER_STMT = _MARK_ORDER_PAID_STMT.where(select(_reserved_lot.c.id).exists())
+
+
+def settle_paid_order(
+    db: Session,
+    order_id: int,
+    lot_id: int,
+    fraction_count: int,
+    external_id: str | None,
+) -> bool:
+    """Reserve the order's fractions on its lot and mark it paid; False if the lot lacks capacity.
+
+    Does not commit: the caller commits on True and rolls back on False.
+    """
+    # Bind names avoid column names so a shared dict never leaks into either SET clause.
+    params = {
+        "order_id": order_id,
+        "paid_lot_id": lot_id,
+        "paid_fractions": fraction_count,
+        "payment_ref": external_id,
+    }
+    if db.get_bind().dialect.name == "postgresql":
+        return db.execute(_SETTLE_ORDER_STMT, params).rowcount == 1
+
+    if db.execute(_RESERVE_LOT_FRACTIONS_STMT, params).rowcount != 1:
+        return False
+    db.execute(_MARK_ORDER_PAID_STMT, params)
+    return True
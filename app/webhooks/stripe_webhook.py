@@ -1,16 +1,45 @@
 import logging
 
-import stripe
+import orjson
 from fastapi import APIRouter, Depends, HTTPException, Request
+from sqlalchemy import bindparam, select
 from sqlalchemy.orm import Session
 
 from app.config import settings
-from app.models import Lot, Order, get_db
+from app.models import Order, get_db
+from app.webhooks.body import read_capped_body, verify_body
+from app.webhooks.settlement import settle_paid_order
 
 router = APIRouter()
 logger = logging.getLogger(__name__)
 
 
+# Row lock on just the columns the payment checks read; no ORM instance is hydrated.
+_PAYABLE_ORDER_STMT = (
+    select(
+        Order.lot_id,
+        Order.fraction_count,
+        Order.amount_eur_cents,
+        Order.payment_method,
+        Order.status,
+    )
+    .where(Order.id == bindparam("order_id"))
+    .with_for_update()
+)
+
+HANDLED_STRIPE_EVENT_TYPES = frozenset({"checkout.session.completed"})
+
+
+def _ignored_event_type(payload: bytes) -> bool:
+    """True for well-formed events of a type we never act on; acking those unverified has no side effects."""
+    try:
+        event = orjson.loads(payload)
+    except orjson.JSONDecodeError:
+        return False
+    event_type = event.get("type") if isinstance(event, dict) else None
+    return isinstance(event_type, str) and event_type not in HANDLED_STRIPE_EVENT_TYPES
+
+
 @router.post(
     "/stripe",
     summary="Stripe webhook",
@@ -24,22 +53,27 @@ async def stripe_webhook(
     mark order as paid and increment lot sold_special_fractions.
     Idempotent: if order already paid, no double spend.
     """
-    payload = await request.body()
+    payload = await read_capped_body(request)
     sig_header = request.headers.get("stripe-signature", "")
 
     if not settings.STRIPE_WEBHOOK_SECRET:
         logger.warning("STRIPE_WEBHOOK_SECRET is not set, skipping webhook verification")
         return {"received": True}
 
+    if _ignored_event_type(payload):
+        return {"received": True}
+
+    import stripe  # deferred: heavy SDK import, only needed once a webhook arrives
+
     try:
-        event = stripe.Webhook.construct_event(
-            payload, sig_header, settings.STRIPE_WEBHOOK_SECRET
+        event = await verify_body(
+            stripe.Webhook.construct_event, payload, sig_header, settings.STRIPE_WEBHOOK_SECRET
         )
     except ValueError as e:
-        logger.error(f"Invalid payload: {e}")
+        logger.error("Invalid payload: %s", e)
         raise HTTPException(status_code=400, detail="Invalid payload")
     except stripe.SignatureVerificationError as e:
-        logger.error(f"Invalid signature: {e}")
+        logger.error("Invalid signature: %s", e)
         raise HTTPException(status_code=400, detail="Invalid signature")
 
     if event["type"] == "checkout.session.completed":
@@ -52,25 +86,25 @@ async def stripe_webhook(
         try:
             order_id = int(order_id_str)
         except (ValueError, TypeError) as e:
-            logger.error(f"Invalid order_id format: {order_id_str}, error: {e}")
+            logger.error("Invalid order_id format: %s, error: %s", order_id_str, e)
             return {"received": True}
 
         if order_id <= 0:
-            logger.warning(f"Invalid non-positive order_id: {order_id}")
+            logger.warning("Invalid non-positive order_id: %s", order_id)
             return {"received": True}
 
         try:
-            order = db.query(Order).filter(Order.id == order_id).with_for_update().first()
+            order = db.execute(_PAYABLE_ORDER_STMT, {"order_id": order_id}).first()
             if not order:
-                logger.warning(f"Order {order_id} not found")
+                logger.warning("Order %s not found", order_id)
                 return {"received": True}
 
             if order.payment_method != "stripe":
-                logger.warning(f"Order {order_id} payment method is {order.payment_method}, not stripe")
+                logger.warning("Order %s payment method is %s, not stripe", order_id, order.payment_method)
                 return {"received": True}
 
             if order.status == "paid":
-                logger.info(f"Order {order_id} already paid, skipping")
+                logger.info("Order %s already paid, skipping", order_id)
                 return {"received": True}
 
 
@@ -93,35 +127,28 @@ async def stripe_webhook(
                     return {"received": True}
 
             currency = session.get("currency")
-            if currency and str(currency).lower() != "eur":
+            # Stripe sends lowercase ISO codes; only normalize when the exact match misses.
+            if currency and currency != "eur" and str(currency).lower() != "eur":
                 logger.warning("Stripe currency mismatch for order %s: %s", order_id, currency)
                 db.rollback()
                 return {"received": True}
 
-            lot = db.query(Lot).filter(Lot.id == order.lot_id).with_for_update().first()
-            if not lot:
-                logger.error(f"Lot {order.lot_id} not found for order {order_id}")
-                db.rollback()
-                return {"received": True}
-
-            remaining = max(0, lot.special_price_fractions_cap - (lot.sold_special_fractions or 0))
-            if order.fraction_count > remaining:
+            lot_id = order.lot_id
+            external_id = session.get("id") or session.get("payment_intent")
+            if not settle_paid_order(db, order_id, lot_id, order.fraction_count, external_id):
                 logger.warning(
-                    "Cannot mark order %s as paid: %s fractions requested, %s remaining",
+                    "Cannot mark order %s as paid: lot %s not found or fewer than %s fractions remaining",
                     order_id,
+                    lot_id,
                     order.fraction_count,
-                    remaining,
                 )
                 db.rollback()
                 return {"received": True}
 
-            order.status = "paid"
-            order.external_payment_id = session.get("id") or session.get("payment_intent")
-            lot.sold_special_fractions = (lot.sold_special_fractions or 0) + order.fraction_count
             db.commit()
-            logger.info(f"Order {order_id} marked as paid, lot {lot.id} updated")
+            logger.info("Order %s marked as paid, lot %s updated", order_id, lot_id)
         except Exception as e:
-            logger.error(f"Error processing order {order_id}: {e}", exc_info=True)
+            logger.error("Error processing order %s: %s", order_id, e, exc_info=True)
             db.rollback()
             raise HTTPException(status_code=500, detail="Internal server error")
 
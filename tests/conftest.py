@@ -2,19 +2,22 @@ import os
 from decimal import Decimal
 from typing import Generator
 from datetime import datetime, timezone
+from functools import lru_cache
 
 # Override settings for tests before importing app modules
-TEST_DATABASE_URL = "sqlite:///./test_app.db"
+# In-memory database; StaticPool below keeps the single connection (and its data) alive.
+TEST_DATABASE_URL = "sqlite://"
 os.environ["DATABASE_URL"] = TEST_DATABASE_URL
 os.environ["JWT_SECRET"] = "test-secret-key-for-testing-only"
 os.environ["STRIPE_SECRET_KEY"] = "sk_test_mock"
 os.environ["STRIPE_WEBHOOK_SECRET"] = "whsec_test_mock"
 os.environ["PAYKILLA_API_KEY"] = "pk_test_mock"
 os.environ["PAYKILLA_WEBHOOK_SECRET"] = "pk_whsec_test_mock"
+os.environ["LOTS_CACHE_TTL_SECONDS"] = "0"
 
 import pytest
 from fastapi.testclient import TestClient
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, event
 from sqlalchemy.orm import Session, sessionmaker
 from sqlalchemy.pool import StaticPool
 
@@ -22,6 +25,7 @@ from app.main import app
 from app.models.database import Base, get_db
 from app.models.lot import Lot
 from app.models.user import User
+from app.services.payment_gateways import get_enabled_payment_methods, get_payment_gateways
 
 # Create test database engine
 test_engine = create_engine(
@@ -29,23 +33,70 @@ test_engine = create_engine(
     connect_args={"check_same_thread": False},
     poolclass=StaticPool,
 )
-TestSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=test_engine)
+TestSessionLocal = sessionmaker(autocommit=False, autoflush=False)
+
+
+@event.listens_for(test_engine, "connect")
+def _configure_sqlite_connection(dbapi_connection, connection_record) -> None:
+    # pysqlite's own BEGIN handling breaks SAVEPOINTs; let SQLAlchemy emit BEGIN instead.
+    dbapi_connection.isolation_level = None
+    cursor = dbapi_connection.cursor()
+    for pragma in ("journal_mode=MEMORY", "synchronous=OFF", "temp_store=MEMORY", "foreign_keys=ON"):
+        cursor.execute(f"PRAGMA {pragma}")
+    cursor.close()
+
+
+@event.listens_for(test_engine, "begin")
+def _emit_begin(connection) -> None:
+    connection.exec_driver_sql("BEGIN")
+
+
+@lru_cache(maxsize=1)
+def _test_password_hash() -> str:
+    """Hash "testpassword123" once; the password hasher is deliberately slow."""
+    from app.api.auth import get_password_hash
+
+    return get_password_hash("testpassword123")
+
+
+@pytest.fixture(scope="session", autouse=True)
+def database_schema() -> Generator[None, None, None]:
+    """Create the schema once; each test runs inside a transaction that is rolled back."""
+    Base.metadata.create_all(bind=test_engine)
+    yield
+    Base.metadata.drop_all(bind=test_engine)
+
+
+@pytest.fixture(autouse=True)
+def reset_payment_gateways() -> Generator[None, None, None]:
+    """Drop memoized gateways so settings patched by a test do not leak into others."""
+    yield
+    get_payment_gateways.cache_clear()
+    get_enabled_payment_methods.cache_clear()
 
 
 @pytest.fixture(scope="function")
 def db() -> Generator[Session, None, None]:
-    """Create a fresh database for each test."""
-    Base.metadata.create_all(bind=test_engine)
-    db_session = TestSessionLocal()
+    """Session whose commits become SAVEPOINTs inside a per-test transaction."""
+    connection = test_engine.connect()
+    transaction = connection.begin()
+    db_session = TestSessionLocal(bind=connection, join_transaction_mode="create_savepoint")
     try:
         yield db_session
     finally:
         db_session.close()
-        Base.metadata.drop_all(bind=test_engine)
+        transaction.rollback()
+        connection.close()
+
+
+@pytest.fixture(scope="session")
+def _session_client() -> TestClient:
+    """One client for the suite; not entered as a context manager, so the app lifespan never runs."""
+    return TestClient(app)
 
 
 @pytest.fixture(scope="function")
-def client(db: Session) -> Generator[TestClient, None, None]:
+def client(_session_client: TestClient, db: Session) -> Generator[TestClient, None, None]:
     """Create a test client with database override."""
 
     def override_get_db():
@@ -55,19 +106,18 @@ def client(db: Session) -> Generator[TestClient, None, None]:
             pass
 
     app.dependency_overrides[get_db] = override_get_db
-    yield TestClient(app)
+    _session_client.cookies.clear()
+    yield _session_client
     app.dependency_overrides.clear()
 
 
 @pytest.fixture
 def test_user(db: Session) -> User:
     """Create a test user."""
-    from app.api.auth import get_password_hash
-
     user = User(
         email="test@example.com",
         display_name="Test User",
-        hashed_password=get_password_hash("testpassword123"),
+        hashed_password=_test_password_hash(),
         is_email_verified=True,
         email_verified_at=datetime.now(timezone.utc),
         terms_accepted_at=datetime.now(timezone.utc),
@@ -82,12 +132,10 @@ def test_user(db: Session) -> User:
 @pytest.fixture
 def test_user2(db: Session) -> User:
     """Create a second test user."""
-    from app.api.auth import get_password_hash
-
     user = User(
         email="test2@example.com",
         display_name="Test User 2",
-        hashed_password=get_password_hash("testpassword123"),
+        hashed_password=_test_password_hash(),
         is_email_verified=True,
         email_verified_at=datetime.now(timezone.utc),
         terms_accepted_at=datetime.now(timezone.utc),
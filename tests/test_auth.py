@@ -126,6 +126,62 @@ def test_login_unverified_email_blocked(client, db):
     assert "verified" in response.json()["detail"].lower()
 
 
+def test_login_upgrades_legacy_pbkdf2_hash(client, db):
+    from passlib.hash import pbkdf2_sha256
+
+    user = User(
+        email="legacy@example.com",
+        display_name="Legacy User",
+        hashed_password=pbkdf2_sha256.hash("testpassword123"),
+        is_email_verified=True,
+        terms_accepted_at=datetime.now(timezone.utc),
+        terms_accepted_ip="127.0.0.1",
+    )
+    db.add(user)
+    db.commit()
+
+    response = client.post(
+        "/api/auth/login",
+        json={"email": "legacy@example.com", "password": "testpassword123"},
+    )
+    assert response.status_code == status.HTTP_200_OK
+
+    db.refresh(user)
+    assert user.hashed_password.startswith("$argon2")
+
+
+def test_login_upgrades_legacy_bcrypt_hash(client, db):
+    import bcrypt
+
+    legacy_hash = bcrypt.hashpw(b"testpassword123", bcrypt.gensalt(rounds=4)).decode()
+    user = User(
+        email="legacy-bcrypt@example.com",
+        display_name="Legacy User",
+        hashed_password=legacy_hash,
+        is_email_verified=True,
+        terms_accepted_at=datetime.now(timezone.utc),
+        terms_accepted_ip="127.0.0.1",
+    )
+    db.add(user)
+    db.commit()
+
+    response = client.post(
+        "/api/auth/login",
+        json={"email": "legacy-bcrypt@example.com", "password": "wrongpassword"},
+    )
+    assert response.status_code == status.HTTP_401_UNAUTHORIZED
+    db.refresh(user)
+    assert user.hashed_password == legacy_hash
+
+    response = client.post(
+        "/api/auth/login",
+        json={"email": "legacy-bcrypt@example.com", "password": "testpassword123"},
+    )
+    assert response.status_code == status.HTTP_200_OK
+    db.refresh(user)
+    assert user.hashed_password.startswith("$argon2")
+
+
 def test_login_wrong_email(client, test_user):
     response = client.post(
         "/api/auth/login",
@@ -165,6 +221,19 @@ def test_login_token_valid(client, test_user):
     assert "exp" in payload
 
 
+def test_create_access_token_matches_jose_encoding(monkeypatch):
+    from app.api.auth import create_access_token
+
+    token = create_access_token(42)
+    payload = jwt.decode(token, settings.JWT_SECRET, algorithms=["HS256"])
+    expected = jwt.encode(payload, settings.JWT_SECRET, algorithm="HS256")
+    assert token == expected
+
+    monkeypatch.setattr(settings, "JWT_ALGORITHM", "HS512")
+    payload = jwt.decode(create_access_token(42), settings.JWT_SECRET, algorithms=["HS512"])
+    assert payload["sub"] == "42"
+
+
 def test_login_expires_in(client, test_user):
     response = client.post(
         "/api/auth/login",
@@ -191,6 +260,37 @@ def test_refresh_success_rotates_token(client, test_user):
     assert reused.status_code == status.HTTP_401_UNAUTHORIZED
 
 
+def test_refresh_links_revoked_token_to_replacement(client, db, test_user):
+    from app.models import RefreshToken
+
+    login = client.post(
+        "/api/auth/login",
+        json={"email": "test@example.com", "password": "testpassword123"},
+    )
+    client.post("/api/auth/refresh", json={"refreshToken": login.json()["refreshToken"]})
+
+    old, new = db.query(RefreshToken).order_by(RefreshToken.id).all()
+    assert old.revoked_at is not None
+    assert old.replaced_by_id == new.id
+    assert new.revoked_at is None
+
+
+def test_refresh_token_hash_stored_as_raw_digest(client, db, test_user):
+    import hashlib
+
+    from app.models import RefreshToken
+
+    login = client.post(
+        "/api/auth/login",
+        json={"email": "test@example.com", "password": "testpassword123"},
+    )
+    refresh_token = login.json()["refreshToken"]
+
+    record = db.query(RefreshToken).filter(RefreshToken.user_id == test_user.id).one()
+    assert record.token_hash == hashlib.sha256(refresh_token.encode("utf-8")).digest()
+    assert len(record.token_hash) == 32
+
+
 def test_logout_revokes_refresh_token(client, test_user):
     login = client.post(
         "/api/auth/login",
@@ -232,7 +332,7 @@ def test_verify_email_request_rate_limit(client):
 
 
 def test_verify_email_request_send_failure_returns_generic_success(client, monkeypatch):
-    monkeypatch.setenv("EMAIL_RESEND_COOLDOWN_SECONDS", "0")
+    monkeypatch.setattr(settings, "EMAIL_RESEND_COOLDOWN_SECONDS", 0)
     with patch("app.api.auth.send_verify_email"):
         register = client.post("/api/auth/register", json=_register_payload(email="resend-fail@example.com"))
     assert register.status_code == status.HTTP_200_OK
@@ -271,6 +371,30 @@ def test_password_reset_flow(client, test_user):
     assert new_login.status_code == status.HTTP_200_OK
 
 
+def test_password_reset_revokes_refresh_tokens(client, test_user):
+    refresh_tokens = [
+        client.post(
+            "/api/auth/login",
+            json={"email": "test@example.com", "password": "testpassword123"},
+        ).json()["refreshToken"]
+        for _ in range(2)
+    ]
+    with patch("app.api.auth.send_password_reset_email") as mock_send:
+        client.post("/api/auth/password/forgot", json={"email": "test@example.com"})
+    client.post(
+        "/api/auth/password/reset",
+        json={
+            "token": mock_send.call_args.args[2],
+            "password": "newpassword123",
+            "confirmPassword": "newpassword123",
+        },
+    )
+
+    for refresh_token in refresh_tokens:
+        reused = client.post("/api/auth/refresh", json={"refreshToken": refresh_token})
+        assert reused.status_code == status.HTTP_401_UNAUTHORIZED
+
+
 def test_password_forgot_nonexistent_user_is_generic(client):
     with patch("app.api.auth.send_password_reset_email") as mock_send:
         response = client.post("/api/auth/password/forgot", json={"email": "nobody@example.com"})
@@ -4,7 +4,8 @@ import pytest
 from sqlalchemy.exc import OperationalError
 
 from app.db_init import init_db, wait_for_db
-from app.models.database import _normalize_database_url
+from app.config import settings
+from app.models.database import _engine_options, _normalize_database_url
 
 
 def test_normalize_database_url_postgres_scheme():
@@ -28,6 +29,15 @@ def test_normalize_database_url_postgresql_with_driver_unchanged():
     )
 
 
+def test_engine_options_disable_prepared_statements_behind_pgbouncer(monkeypatch):
+    url = "postgresql+psycopg://user:pass@db:5432/app"
+    assert "prepare_threshold" not in _engine_options(url)["connect_args"]
+
+    monkeypatch.setattr(settings, "DB_PGBOUNCER", True)
+    assert _engine_options(url)["connect_args"]["prepare_threshold"] is None
+    assert _engine_options("sqlite:///:memory:") == {}
+
+
 def test_wait_for_db_retries_until_success(monkeypatch):
     connect_mock = MagicMock()
     connect_mock.side_effect = [
@@ -61,6 +71,23 @@ def test_wait_for_db_raises_after_exhausted_retries(monkeypatch):
     assert connect_mock.call_count == 2
 
 
+def test_wait_for_db_backs_off_exponentially(monkeypatch):
+    connect_mock = MagicMock(
+        side_effect=OperationalError("stmt", {}, Exception("persistent failure"))
+    )
+    engine_mock = MagicMock()
+    engine_mock.connect = connect_mock
+    sleep_mock = MagicMock()
+
+    monkeypatch.setattr("app.db_init.engine", engine_mock)
+    monkeypatch.setattr("app.db_init.time.sleep", sleep_mock)
+
+    with pytest.raises(RuntimeError, match="Database is unreachable"):
+        wait_for_db(retries=6, retry_delay_seconds=4)
+
+    assert [call.args[0] for call in sleep_mock.call_args_list] == [4, 8, 16, 30, 30]
+
+
 def test_init_db_runs_alembic_for_sqlite(monkeypatch):
     monkeypatch.setenv("DATABASE_URL", "sqlite:///:memory:")
 
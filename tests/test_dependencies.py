@@ -77,12 +77,28 @@ def test_get_current_user_nonexistent_user(client, db):
     )
     
     response = client.get(
-        "/api/orders/me",
+        "/api/auth/me",
         headers={"Authorization": f"Bearer {token}"},
     )
     assert response.status_code == status.HTTP_401_UNAUTHORIZED
 
 
+def test_get_current_user_id_skips_user_lookup(client, db):
+    """Test that order reads trust the token and simply find no orders for an unknown user."""
+    token = jwt.encode(
+        {"sub": "99999", "exp": datetime.now(timezone.utc) + timedelta(hours=1)},
+        settings.JWT_SECRET,
+        algorithm=settings.JWT_ALGORITHM,
+    )
+
+    response = client.get(
+        "/api/orders/me",
+        headers={"Authorization": f"Bearer {token}"},
+    )
+    assert response.status_code == status.HTTP_200_OK
+    assert response.json()["data"] == []
+
+
 def test_get_current_user_optional_none(client, db):
     """Test get_current_user_optional returns None when no credentials."""
     user = get_current_user_optional(None, db)
@@ -106,3 +122,32 @@ def test_get_current_user_raises_exception(client):
     # relies on dependency injection. Verify via endpoint behavior instead.
     response = client.get("/api/orders/me")
     assert response.status_code == status.HTTP_401_UNAUTHORIZED
+
+
+def test_decode_access_token_matches_jose(test_user):
+    """Test the HS256 fast path accepts and rejects the same tokens as jose."""
+    import pytest
+    from jose import JWTError
+
+    from app.services.access_tokens import create_access_token, decode_access_token
+
+    token = create_access_token(test_user.id)
+    assert decode_access_token(token) == jwt.decode(token, settings.JWT_SECRET, algorithms=["HS256"])
+
+    header, payload, signature = token.split(".")
+    tampered = f"{header}.{payload}.{signature[:-2]}AA"
+    expired = jwt.encode(
+        {"sub": str(test_user.id), "exp": datetime.now(timezone.utc) - timedelta(minutes=1)},
+        settings.JWT_SECRET,
+        algorithm="HS256",
+    )
+    foreign_audience = jwt.encode(
+        {"sub": str(test_user.id), "aud": "other-service"},
+        settings.JWT_SECRET,
+        algorithm="HS256",
+    )
+    for invalid in (tampered, expired, foreign_audience, "not-a-token"):
+        with pytest.raises(JWTError):
+            jwt.decode(invalid, settings.JWT_SECRET, algorithms=["HS256"])
+        with pytest.raises(JWTError):
+            decode_access_token(invalid)
@@ -115,7 +115,7 @@ def test_full_order_flow(client, db, test_lot):
     # 10. Get my orders
     my_orders_response = client.get("/api/orders/me", headers=headers)
     assert my_orders_response.status_code == status.HTTP_200_OK
-    orders = my_orders_response.json()
+    orders = my_orders_response.json()["data"]
     assert len(orders) >= 1
     assert any(o["id"] == order_id for o in orders)
 
@@ -124,3 +124,44 @@ def test_get_lot_all_fields(client, test_lot):
     ]
     for field in required_fields:
         assert field in data, f"Missing field: {field}"
+
+
+def test_list_lots_etag_not_modified(client, test_lot):
+    """Test that a matching If-None-Match returns 304 without a body."""
+    response = client.get("/api/lots")
+    etag = response.headers["etag"]
+
+    response = client.get("/api/lots", headers={"If-None-Match": etag})
+    assert response.status_code == status.HTTP_304_NOT_MODIFIED
+    assert response.content == b""
+
+
+def test_list_lots_cache_invalidated_by_sold_fractions(client, db, test_lot, monkeypatch):
+    """Test that cached list is reused until sold fractions change."""
+    from app.config import settings
+
+    monkeypatch.setattr(settings, "LOTS_CACHE_TTL_SECONDS", 60)
+    monkeypatch.setattr("app.api.lots._lots_cache", {})
+
+    first = client.get("/api/lots")
+    test_lot.name = "Renamed Lot"
+    db.commit()
+    assert client.get("/api/lots").json()[0]["name"] == "Test Lot"
+
+    test_lot.sold_special_fractions = 10
+    db.commit()
+    response = client.get("/api/lots")
+    assert response.json()[0]["name"] == "Renamed Lot"
+    assert response.headers["etag"] != first.headers["etag"]
+
+
+def test_format_micro_eur_matches_normalized_decimal():
+    """Test integer price formatting against the Decimal rendering it replaces."""
+    from decimal import Decimal
+
+    from app.models.lot import format_micro_eur, micro_eur_to_decimal
+
+    for micros in (0, 30_000, 90_000, 1_000_000, 10_000_000, 1_234_500, 92_500):
+        assert format_micro_eur(micros) == format(micro_eur_to_decimal(micros).normalize(), "f")
+    assert format_micro_eur(1_234_500) == "1.2345"
+    assert micro_eur_to_decimal(92_500) == Decimal("0.0925")
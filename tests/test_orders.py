@@ -1,3 +1,5 @@
+from datetime import datetime, timedelta, timezone
+from decimal import Decimal
 from unittest.mock import patch
 
 import pytest
@@ -167,6 +169,26 @@ def test_create_order_price_calculation(client, test_lot, auth_headers, db):
         assert order.amount_eur_cents == expected_cents
 
 
+def test_create_order_truncates_sub_cent_amount(client, test_lot, auth_headers, db):
+    """Test that sub-cent totals are truncated to whole cents."""
+    test_lot.price_special_eur = Decimal("0.0125")
+    db.commit()
+
+    with patch("app.services.stripe_service.stripe.checkout.Session.create") as mock_stripe:
+        mock_stripe.return_value.url = "https://checkout.stripe.com/test"
+        mock_stripe.return_value.id = "cs_test_123"
+
+        response = client.post(
+            "/api/orders",
+            json={"lot_id": test_lot.id, "fraction_count": 3, "payment_method": "stripe"},
+            headers=auth_headers,
+        )
+
+    assert response.status_code == status.HTTP_200_OK
+    order = db.query(Order).filter(Order.id == response.json()["order_id"]).first()
+    assert order.amount_eur_cents == 3
+
+
 def test_create_order_custom_urls(client, test_lot, auth_headers):
     """Test order creation with custom return_url and cancel_url."""
     with patch("app.services.stripe_service.stripe.checkout.Session.create") as mock_stripe:
@@ -251,13 +273,14 @@ def test_get_my_orders_success(client, test_user, test_lot, auth_headers, db):
     
     response = client.get("/api/orders/me", headers=auth_headers)
     assert response.status_code == status.HTTP_200_OK
-    data = response.json()
+    data = response.json()["data"]
     assert isinstance(data, list)
     assert len(data) >= 2
     
     # Check that orders belong to the user
     for order in data:
         assert order["lot_id"] == test_lot.id
+        assert order["lot_name"] == "Test Lot"
 
 
 def test_get_my_orders_only_current_user(client, test_user, test_user2, test_lot, auth_headers, db):
@@ -286,7 +309,7 @@ def test_get_my_orders_only_current_user(client, test_user, test_user2, test_lot
     
     response = client.get("/api/orders/me", headers=auth_headers)
     assert response.status_code == status.HTTP_200_OK
-    data = response.json()
+    data = response.json()["data"]
     
     # Should only return orders for test_user
     user_order_ids = [o["id"] for o in data if o["id"] == order1.id]
@@ -294,6 +317,83 @@ def test_get_my_orders_only_current_user(client, test_user, test_user2, test_lot
     assert order2.id not in [o["id"] for o in data]
 
 
+def test_get_my_orders_cursor_pagination(client, test_user, test_lot, auth_headers, db):
+    """Test that pages follow next_cursor newest first, including created_at ties."""
+    created_at = datetime(2026, 1, 1, tzinfo=timezone.utc)
+    orders = [
+        Order(
+            user_id=test_user.id,
+            lot_id=test_lot.id,
+            fraction_count=index + 1,
+            amount_eur_cents=100,
+            payment_method="stripe",
+            status="pending",
+            created_at=created_at + timedelta(minutes=index // 2),
+        )
+        for index in range(5)
+    ]
+    db.add_all(orders)
+    db.commit()
+    expected_ids = [o.id for o in sorted(orders, key=lambda o: (o.created_at, o.id), reverse=True)]
+
+    seen_ids = []
+    cursor = None
+    while True:
+        params = {"limit": 2}
+        if cursor:
+            params["cursor"] = cursor
+        response = client.get("/api/orders/me", params=params, headers=auth_headers)
+        assert response.status_code == status.HTTP_200_OK
+        page = response.json()
+        assert len(page["data"]) <= 2
+        seen_ids.extend(o["id"] for o in page["data"])
+        cursor = page["next_cursor"]
+        if cursor is None:
+            break
+
+    assert seen_ids == expected_ids
+
+
+def test_get_my_orders_invalid_cursor(client, auth_headers):
+    """Test that a malformed cursor is rejected."""
+    response = client.get("/api/orders/me", params={"cursor": "not-a-cursor"}, headers=auth_headers)
+    assert response.status_code == status.HTTP_400_BAD_REQUEST
+
+
+def test_stream_my_orders_ndjson(client, test_user, test_user2, test_lot, auth_headers, db):
+    """Test that the stream returns every order of the current user as NDJSON, newest first."""
+    import json
+
+    created_at = datetime(2026, 1, 1, tzinfo=timezone.utc)
+    orders = [
+        Order(
+            user_id=user.id,
+            lot_id=test_lot.id,
+            fraction_count=100,
+            amount_eur_cents=300,
+            payment_method="stripe",
+            status="pending",
+            created_at=created_at + timedelta(minutes=index),
+        )
+        for index, user in enumerate([test_user, test_user, test_user2, test_user])
+    ]
+    db.add_all(orders)
+    db.commit()
+    expected_ids = [orders[3].id, orders[1].id, orders[0].id]
+
+    response = client.get("/api/orders/me/stream", headers=auth_headers)
+    assert response.status_code == status.HTTP_200_OK
+    assert response.headers["content-type"] == "application/x-ndjson"
+
+    lines = [json.loads(line) for line in response.text.splitlines()]
+    assert [line["id"] for line in lines] == expected_ids
+    assert lines[0]["lot_name"] == "Test Lot"
+    assert lines[0]["payment_method"] == "stripe"
+
+    page = client.get("/api/orders/me", headers=auth_headers).json()["data"]
+    assert [line["created_at"] for line in lines] == [o["created_at"] for o in page]
+
+
 def test_get_my_orders_unauthorized(client):
     """Test getting orders without authentication."""
     response = client.get("/api/orders/me")
@@ -372,6 +472,26 @@ def test_get_payment_methods(client):
     assert set(data["enabled_methods"]).issubset({"stripe", "paykilla"})
 
 
+def test_create_order_disabled_payment_method(client, test_lot, auth_headers, monkeypatch):
+    """Disabled gateways are excluded from enabled methods and reject orders."""
+    from app.config import settings
+    from app.services.payment_gateways import get_enabled_payment_methods, get_payment_gateways
+
+    monkeypatch.setattr(settings, "PAYKILLA_API_KEY", "")
+    get_payment_gateways.cache_clear()
+    get_enabled_payment_methods.cache_clear()
+
+    data = client.get("/api/orders/payment-methods").json()
+    assert data["enabled_methods"] == ["stripe"]
+
+    response = client.post(
+        "/api/orders",
+        json={"lot_id": test_lot.id, "fraction_count": 1000, "payment_method": "paykilla"},
+        headers=auth_headers,
+    )
+    assert response.status_code == status.HTTP_503_SERVICE_UNAVAILABLE
+
+
 def test_create_order_uses_gateway_default_urls(client, test_lot, auth_headers):
     """Order creation uses gateway defaults when custom URLs are absent."""
     with patch("app.services.stripe_service.stripe.checkout.Session.create") as mock_stripe:
@@ -2,6 +2,7 @@ from unittest.mock import MagicMock, patch
 
 import pytest
 
+from app.config import settings
 from app.services import paykilla_service, stripe_service
 
 
@@ -33,25 +34,19 @@ def test_stripe_create_checkout_session_success():
         assert call_kwargs["metadata"]["order_id"] == "1"
 
 
-def test_stripe_create_checkout_session_no_secret():
+def test_stripe_create_checkout_session_no_secret(monkeypatch):
     """Test Stripe service error when secret key is not set."""
-    import os
-    original_key = os.environ.get("STRIPE_SECRET_KEY")
-    os.environ["STRIPE_SECRET_KEY"] = ""
-    
-    try:
-        with pytest.raises(ValueError, match="STRIPE_SECRET_KEY"):
-            stripe_service.create_checkout_session(
-                order_id=1,
-                amount_eur_cents=3000,
-                fraction_count=1000,
-                lot_name="Test Lot",
-                success_url="https://example.com/success",
-                cancel_url="https://example.com/cancel",
-            )
-    finally:
-        if original_key:
-            os.environ["STRIPE_SECRET_KEY"] = original_key
+    monkeypatch.setattr(settings, "STRIPE_SECRET_KEY", "")
+
+    with pytest.raises(ValueError, match="STRIPE_SECRET_KEY"):
+        stripe_service.create_checkout_session(
+            order_id=1,
+            amount_eur_cents=3000,
+            fraction_count=1000,
+            lot_name="Test Lot",
+            success_url="https://example.com/success",
+            cancel_url="https://example.com/cancel",
+        )
 
 
 def test_stripe_create_checkout_session_parameters():
@@ -124,23 +119,17 @@ def test_paykilla_create_payment_success():
     assert "example.com/success" in url
 
 
-def test_paykilla_create_payment_no_api_key():
+def test_paykilla_create_payment_no_api_key(monkeypatch):
     """Test PayKilla service error when API key is not set."""
-    import os
-    original_key = os.environ.get("PAYKILLA_API_KEY")
-    os.environ["PAYKILLA_API_KEY"] = ""
-    
-    try:
-        with pytest.raises(ValueError, match="PAYKILLA_API_KEY"):
-            paykilla_service.create_payment(
-                order_id=1,
-                amount_eur_cents=3000,
-                success_url="https://example.com/success",
-                cancel_url="https://example.com/cancel",
-            )
-    finally:
-        if original_key:
-            os.environ["PAYKILLA_API_KEY"] = original_key
+    monkeypatch.setattr(settings, "PAYKILLA_API_KEY", "")
+
+    with pytest.raises(ValueError, match="PAYKILLA_API_KEY"):
+        paykilla_service.create_payment(
+            order_id=1,
+            amount_eur_cents=3000,
+            success_url="https://example.com/success",
+            cancel_url="https://example.com/cancel",
+        )
 
 
 def test_paykilla_create_payment_returns_url():
@@ -167,3 +156,59 @@ def test_paykilla_create_payment_preserves_existing_query_params_and_fragments()
     )
 
     assert url == "https://custom.com/success?param=value&order_id=123#checkout"
+
+
+def test_append_query_param_without_existing_query():
+    """Test the no-query fast path keeps fragments and encodes like urlencode."""
+    from app.services.url_utils import append_query_param
+
+    assert append_query_param("https://custom.com/success", "order_id", 7) == "https://custom.com/success?order_id=7"
+    assert (
+        append_query_param("https://custom.com/success#checkout", "order_id", 7)
+        == "https://custom.com/success?order_id=7#checkout"
+    )
+    assert append_query_param("https://custom.com/#", "a b", "c&d") == "https://custom.com/?a+b=c%26d"
+
+
+def test_send_email_reuses_smtp_connection(monkeypatch):
+    """Test that consecutive emails share one authenticated SMTP connection."""
+    import queue
+
+    from app.services import email_service
+
+    monkeypatch.setattr(settings, "SMTP_HOST", "smtp.example.com")
+    monkeypatch.setattr(settings, "SMTP_FROM_EMAIL", "noreply@example.com")
+    monkeypatch.setattr(settings, "SMTP_USER", "user")
+    monkeypatch.setattr(email_service, "_smtp_pool", queue.LifoQueue())
+
+    with patch("app.services.email_service.smtplib.SMTP") as mock_smtp_cls:
+        smtp = mock_smtp_cls.return_value
+        smtp.noop.return_value = (250, b"OK")
+        email_service.send_verify_email("a@example.com", None, "token-1")
+        email_service.send_password_reset_email("b@example.com", None, "token-2")
+
+    mock_smtp_cls.assert_called_once()
+    smtp.login.assert_called_once()
+    assert smtp.send_message.call_count == 2
+
+
+def test_send_email_reconnects_after_stale_connection(monkeypatch):
+    """Test that a pooled connection failing NOOP is replaced."""
+    import queue
+    import smtplib
+
+    from app.services import email_service
+
+    monkeypatch.setattr(settings, "SMTP_HOST", "smtp.example.com")
+    monkeypatch.setattr(settings, "SMTP_FROM_EMAIL", "noreply@example.com")
+    stale = MagicMock()
+    stale.noop.side_effect = smtplib.SMTPServerDisconnected()
+    pool = queue.LifoQueue()
+    pool.put(stale)
+    monkeypatch.setattr(email_service, "_smtp_pool", pool)
+
+    with patch("app.services.email_service.smtplib.SMTP") as mock_smtp_cls:
+        email_service.send_verify_email("a@example.com", None, "token-1")
+
+    stale.close.assert_called_once()
+    mock_smtp_cls.return_value.send_message.assert_called_once()
@@ -1,3 +1,4 @@
+import anyio.to_thread
 import json
 from unittest.mock import patch
 
@@ -5,6 +6,7 @@ import pytest
 import stripe
 from fastapi import status
 
+from app.config import settings
 from app.models.lot import Lot
 from app.models.order import Order
 
@@ -200,22 +202,31 @@ def test_stripe_webhook_other_event_type(client):
         assert response.status_code == status.HTTP_200_OK
 
 
-def test_stripe_webhook_no_secret(client):
-    """Test Stripe webhook when webhook secret is not set."""
-    import os
-    original_secret = os.environ.get("STRIPE_WEBHOOK_SECRET")
-    os.environ["STRIPE_WEBHOOK_SECRET"] = ""
-    
-    try:
+def test_stripe_webhook_ignored_event_type_skips_verification(client):
+    """Test that unhandled event types are acknowledged without constructing the event."""
+    event_data = {"id": "evt_test", "type": "customer.created", "data": {"object": {}}}
+
+    with patch("stripe.Webhook.construct_event") as mock_construct:
         response = client.post(
             "/webhooks/stripe",
-            content=b"{}",
-            headers={"stripe-signature": "test"},
+            content=json.dumps(event_data).encode(),
+            headers={"stripe-signature": "test_signature"},
         )
-        assert response.status_code == status.HTTP_200_OK
-    finally:
-        if original_secret:
-            os.environ["STRIPE_WEBHOOK_SECRET"] = original_secret
+
+    assert response.status_code == status.HTTP_200_OK
+    mock_construct.assert_not_called()
+
+
+def test_stripe_webhook_no_secret(client, monkeypatch):
+    """Test Stripe webhook when webhook secret is not set."""
+    monkeypatch.setattr(settings, "STRIPE_WEBHOOK_SECRET", "")
+
+    response = client.post(
+        "/webhooks/stripe",
+        content=b"{}",
+        headers={"stripe-signature": "test"},
+    )
+    assert response.status_code == status.HTTP_200_OK
 
 
 import hashlib
@@ -454,6 +465,41 @@ def test_paykilla_webhook_capacity_exceeded_keeps_order_pending(client, test_use
     assert test_lot.sold_special_fractions == test_lot.special_price_fractions_cap
 
 
+def test_stripe_webhook_capacity_exceeded_keeps_order_pending(client, test_user, test_lot, db):
+    """When lot cap is exhausted, Stripe webhook must not move order to paid."""
+    test_lot.sold_special_fractions = test_lot.special_price_fractions_cap - 1
+    db.commit()
+
+    order = Order(
+        user_id=test_user.id,
+        lot_id=test_lot.id,
+        fraction_count=2,
+        amount_eur_cents=6,
+        payment_method="stripe",
+        status="pending",
+    )
+    db.add(order)
+    db.commit()
+
+    event_data = {
+        "id": "evt_over_cap",
+        "type": "checkout.session.completed",
+        "data": {"object": {"id": "cs_over_cap", "metadata": {"order_id": str(order.id)}}},
+    }
+    with patch("stripe.Webhook.construct_event", return_value=event_data):
+        response = client.post(
+            "/webhooks/stripe",
+            content=json.dumps(event_data).encode(),
+            headers={"stripe-signature": "test_signature"},
+        )
+
+    assert response.status_code == status.HTTP_200_OK
+    db.refresh(order)
+    db.refresh(test_lot)
+    assert order.status == "pending"
+    assert test_lot.sold_special_fractions == test_lot.special_price_fractions_cap - 1
+
+
 def test_stripe_webhook_non_positive_order_id(client):
     """Stripe webhook should ignore non-positive order_id."""
     event_data = {
@@ -507,7 +553,6 @@ def test_paykilla_webhook_non_positive_amount_returns_400(client, test_user, tes
 
 def test_paykilla_webhook_non_positive_order_id_with_valid_signature(client):
     """PayKilla callback should return 400 for non-positive order_id with valid signature."""
-    from app.config import settings
     import hmac
     import hashlib
 
@@ -526,3 +571,37 @@ def test_paykilla_webhook_non_positive_order_id_with_valid_signature(client):
 
     assert response.status_code == status.HTTP_400_BAD_REQUEST
     assert "positive" in response.json()["detail"]
+
+
+def test_webhook_rejects_oversized_payload(client):
+    """Test that webhook bodies above the size cap are rejected before signature checks."""
+    from app.webhooks.body import WEBHOOK_MAX_BODY_BYTES
+
+    oversized = b"x" * (WEBHOOK_MAX_BODY_BYTES + 1)
+    for path in ("/webhooks/paykilla", "/webhooks/stripe"):
+        response = client.post(path, content=oversized)
+        assert response.status_code == status.HTTP_413_REQUEST_ENTITY_TOO_LARGE
+
+
+def test_settle_order_statement_is_single_postgres_round_trip():
+    from sqlalchemy.dialects import postgresql
+
+    from app.webhooks.settlement import _SETTLE_ORDER_STMT
+
+    sql = str(_SETTLE_ORDER_STMT.compile(dialect=postgresql.dialect()))
+    assert sql.startswith("WITH reserved_lot AS")
+    assert "RETURNING lots.id" in sql
+    assert "UPDATE orders SET" in sql
+    assert "EXISTS (SELECT reserved_lot.id" in sql
+
+
+def test_paykilla_webhook_large_payload_verified_off_loop(client):
+    from app.webhooks.body import INLINE_VERIFY_MAX_BYTES
+    from app.webhooks.paykilla_callback import _verify_paykilla_signature
+
+    payload = {"order_id": 99999, "padding": "x" * (INLINE_VERIFY_MAX_BYTES + 1)}
+    with patch("anyio.to_thread.run_sync", wraps=anyio.to_thread.run_sync) as run_sync:
+        assert _paykilla_post(client, payload, secret="wrong-secret").status_code == status.HTTP_401_UNAUTHORIZED
+        assert _paykilla_post(client, payload).status_code == status.HTTP_200_OK
+    verify_calls = [call for call in run_sync.call_args_list if call.args[0] is _verify_paykilla_signature]
+    assert len(verify_calls) == 2